@@ -1,8 +1,11 @@
 from __future__ import annotations
-from collections.abc import Iterable, Iterator
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
 from enum import Enum
-from functools import cached_property
+from functools import lru_cache
 from random import choice, randint, sample
+from typing import Any
+from weakref import WeakValueDictionary
 
 # Definición de tipo Binding. Un binding es una asignación de variables a fórmulas.
 Binding = dict["Var", "Formula"]
@@ -35,6 +38,41 @@ class OrderType(Enum):
     BREADTH_FIRST = 1
 
 
+class slot_property:
+    """
+    Equivalente a functools.cached_property para clases con __slots__: el
+    resultado se guarda en un slot auxiliar (_<nombre>_cache) en el primer
+    acceso. El slot correspondiente debe declararse en __slots__ de la clase.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.slot = "_" + func.__name__.lstrip("_") + "_cache"
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self.slot)
+        except AttributeError:
+            value = self.func(obj)
+            setattr(obj, self.slot, value)
+            return value
+
+
+# Etiquetas enteras de tipo de nodo. Cada clase concreta de fórmula expone la
+# suya en el atributo de clase `kind`, de modo que los bucles calientes pueden
+# despachar con comparaciones enteras (kind >= KIND_AND implica operador
+# binario, kind == KIND_NEG operador unario) en lugar de cadenas de isinstance.
+KIND_VAR = 0
+KIND_CONST = 1
+KIND_NEG = 2
+KIND_AND = 3
+KIND_OR = 4
+KIND_IMP = 5
+
+
 class Formula:
     """
     Representación de fórmulas proposicionales.
@@ -54,6 +92,32 @@ class Formula:
     Aquí es dónde se encuentra esta recursividad.
     """
 
+    # Sin __dict__ por instancia: además de la firma estructural, se declara
+    # un slot por cada propiedad perezosa (ver slot_property). Los árboles
+    # grandes de Formula.random pasan de ~200 a unas decenas de bytes por nodo.
+    __slots__ = (
+        "_sig",
+        "_graph_cache",
+        "_vars_cache",
+        "_vars_mask_cache",
+        "_consts_cache",
+        "_simp_double_neg_cache",
+        "_subs_imp_cache",
+        "_push_neg_cache",
+        "_nnf_cache",
+        "_nnf_neg_cache",
+        "_distribute_or_cache",
+        "_distribute_or_step_cache",
+        "_simp_const_cache",
+        "_simp_const_step_cache",
+        "_CNF_cache",
+        "_CNF_structured_cache",
+        "_CNF_masks_cache",
+        "_is_tauto_cache",
+    )
+
+    kind: int
+
     def __repr__(self):
         """
         Representación en string de la fórmula. Las clases que heredan de
@@ -70,45 +134,36 @@ class Formula:
         raise NotImplementedError()
 
     @staticmethod
-    def parse_polish(string: str, stack: list[Formula] = []) -> Formula | None:
+    def parse_polish(string: str) -> Formula | None:
         """
         Dada una string de una fórmula en notación polaca, construye y devuelve
         la fórmula correspondiente.
+
+        La string se recorre iterativamente desde el final manteniendo una
+        pila de fórmulas, sin recursión (las fórmulas largas no agotan el
+        límite de recursión) y despachando cada símbolo por diccionario.
         """
-        string = string.replace(" ", "")
-        if len(string) == 0:
-            return stack.pop()
-        match string[-1]:
-            case Neg.symbol:
+        stack: list[Formula] = []
+        for c in reversed(string.replace(" ", "")):
+            entry = _POLISH_DISPATCH.get(c)
+            if entry is None:
+                assert c in _VAR_NAME_SET
+                stack.append(Var(c))
+                continue
+            arity, value = entry
+            if arity == 0:
+                stack.append(value)
+            elif arity == 1:
                 assert len(stack) >= 1
-                f = stack.pop()
-                stack.append(Neg(f))
-                return Formula.parse_polish(string[0:-1], stack)
-            case And.symbol:
-                assert len(stack) >= 2
-                A = stack.pop()
-                B = stack.pop()
-                stack.append(And(A, B))
-            case Or.symbol:
-                assert len(stack) >= 2
-                A = stack.pop()
-                B = stack.pop()
-                stack.append(Or(A, B))
-            case Imp.symbol:
+                stack.append(value(stack.pop()))
+            else:
                 assert len(stack) >= 2
                 A = stack.pop()
                 B = stack.pop()
-                stack.append(Imp(A, B))
-            case "T":
-                stack.append(Const.TRUE)
-            case "F":
-                stack.append(Const.FALSE)
-            case _ as c:
-                assert c in Var.var_names
-                stack.append(Var(c))
-        return Formula.parse_polish(string[0:-1], stack)
+                stack.append(value(A, B))
+        return stack.pop()
 
-    @cached_property
+    @slot_property
     def graph(self):
         """
         Código fuente de la representación del árbol de la fórmula en Graphviz.
@@ -169,8 +224,11 @@ class Formula:
         graphviz.render("dot", "pdf", filepath).replace("\\", "/")
 
     def __eq__(self, other):
-        """Dos fórmulas son iguales si su representación en string es igual."""
-        return str(self) == str(other)
+        """
+        Dos fórmulas estructuralmente iguales comparten instancia gracias al
+        hash-consing, así que la igualdad se reduce a identidad de punteros.
+        """
+        return self is other
 
     def __invert__(self):
         """Override del operador ~ para la negación."""
@@ -189,34 +247,73 @@ class Formula:
         return Imp(self, other)
 
     def __hash__(self):
-        """El hash de una fórmula es el hash de su representación en string."""
-        return hash(repr(self))
+        """
+        El hash es la firma estructural precalculada en la construcción, en
+        lugar de construir y hashear la representación en string completa.
+        """
+        return self._sig
 
     def __len__(self) -> int:
-        """La longitud de una fórmula es el número de nodos en su árbol."""
-        match self:
-            case Var() | Const():
-                return 1
-            case UnaryOperator():
-                return 1 + len(self.f)
-            case BinaryOperator():
-                return 1 + len(self.left) + len(self.right)
-            case _:
-                raise ValueError("UNREACHABLE")
+        """
+        La longitud de una fórmula es el número de nodos en su árbol.
+        Se cuenta con una pila de trabajo explícita en lugar de recursión,
+        para que las fórmulas muy profundas no agoten la pila de Python.
+        """
+        n = 0
+        stack: list[Formula] = [self]
+        while stack:
+            f = stack.pop()
+            n += 1
+            kind = f.kind
+            if kind >= KIND_AND:
+                stack.append(f.left)
+                stack.append(f.right)
+            elif kind == KIND_NEG:
+                stack.append(f.f)
+        return n
 
     @staticmethod
     def random(n_vars: int, max_depth: int, include_consts: bool = False) -> Formula:
         """
-        Generador de fórmulas aleatorias, en base a Formula.random_polish.
-        Esta función es un wrapper de Formula.parse_polish, en el que
-        posteriormente a la generación aleatoria, se convierte la
-        representación en una fórmula utilizando Formula.parse_polish.
+        Generador de fórmulas aleatorias.
+
+        Construye el árbol directamente con una pila de trabajo explícita,
+        sin generar ni reparsear la notación polaca y sin recursión, con la
+        misma distribución que Formula.random_polish.
+
+        Args:
+            n_vars: número máximo de variables que incluir
+            max_depth: profundidad máxima del árbol de la fórmula
+            include_consts: si se incluyen las constantes T y F en la fórmula.
         """
-        f = Formula.parse_polish(
-            Formula.random_polish(n_vars, max_depth, include_consts)
-        )
-        assert isinstance(f, Formula)
-        return f
+        assert max_depth >= 1
+        vars = _ordered_vars(n_vars)
+        values: list[Formula] = []
+        # La pila mezcla profundidades pendientes de expandir con operadores
+        # (clases) a la espera de que sus hijos estén en la pila de valores.
+        stack: list[Any] = [max_depth]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, int):
+                if item == 1:
+                    if include_consts and randint(0, 1) == 0:
+                        values.append(choice((Const.TRUE, Const.FALSE)))
+                    else:
+                        values.append(choice(vars))
+                elif (op := randint(0, 3)) == 0:
+                    stack.append(Neg)
+                    stack.append(randint(1, item - 1))
+                else:
+                    stack.append((And, Or, Imp)[op - 1])
+                    stack.append(randint(1, item - 1))
+                    stack.append(randint(1, item - 1))
+            elif item is Neg:
+                values.append(Neg(values.pop()))
+            else:
+                right = values.pop()
+                left = values.pop()
+                values.append(item(left, right))
+        return values[0]
 
     @staticmethod
     def random_polish(n_vars: int, max_depth: int, include_consts: bool = False) -> str:
@@ -232,55 +329,142 @@ class Formula:
             representación en notación polaca de la fórmula generada.
         """
         assert max_depth >= 1
-        if max_depth == 1:
-            if include_consts and randint(0, 1) == 0:
-                return choice(["T", "F"])
-            return str(choice(Var.generate(n_vars)))
-        else:
-            f_ = lambda: Formula.random_polish(
-                n_vars, randint(1, max_depth - 1), include_consts
-            )
-            match randint(0, 3):
-                case 0:
-                    return f"¬ {f_()}"
-                case 1:
-                    return f"∧ {f_()} {f_()}"
-                case 2:
-                    return f"∨ {f_()} {f_()}"
-                case 3:
-                    return f"→ {f_()} {f_()}"
-                case _:
-                    raise ValueError("UNREACHABLE")
+        vars = _ordered_vars(n_vars)
+        tokens: list[str] = []
+        # La notación polaca es el preorden del árbol, así que basta emitir
+        # tokens a una lista mientras se expanden profundidades pendientes,
+        # y unirlos una sola vez al final (sin recursión ni concatenaciones
+        # intermedias O(d²)).
+        stack: list[int] = [max_depth]
+        while stack:
+            depth = stack.pop()
+            if depth == 1:
+                if include_consts and randint(0, 1) == 0:
+                    tokens.append(choice(("T", "F")))
+                else:
+                    tokens.append(str(choice(vars)))
+            elif (op := randint(0, 3)) == 0:
+                tokens.append("¬")
+                stack.append(randint(1, depth - 1))
+            else:
+                tokens.append(("∧", "∨", "→")[op - 1])
+                stack.append(randint(1, depth - 1))
+                stack.append(randint(1, depth - 1))
+        return " ".join(tokens)
 
-    @cached_property
-    def vars(self) -> set["Var"]:
-        """Conjunto de variables de una fórmula."""
-        match self:
-            case Var():
-                return {self}
-            case Const():
-                return set()
-            case UnaryOperator():
-                return self.f.vars
-            case BinaryOperator():
-                return self.left.vars.union(self.right.vars)
-            case _:
-                raise ValueError("UNREACHABLE")
+    @slot_property
+    def vars(self) -> frozenset["Var"]:
+        """
+        Conjunto de variables de una fórmula.
 
-    @cached_property
-    def consts(self) -> set["Const"]:
+        Se recorre el árbol iterativamente y el resultado se cachea como
+        frozenset en el primer acceso, de modo que los accesos posteriores
+        (frecuentes al construir reglas y comprobar demostraciones) no
+        vuelvan a recorrer el árbol.
+        """
+        result: set[Var] = set()
+        stack: list[Formula] = [self]
+        while stack:
+            f = stack.pop()
+            kind = f.kind
+            if kind >= KIND_AND:
+                stack.append(f.left)
+                stack.append(f.right)
+            elif kind == KIND_NEG:
+                stack.append(f.f)
+            elif kind == KIND_VAR:
+                result.add(f)
+        return frozenset(result)
+
+    @slot_property
+    def vars_mask(self) -> int:
+        """
+        Máscara de bits de las variables de la fórmula: el bit i está activo
+        si la fórmula contiene Var.var_names[i]. Permite operaciones de
+        conjuntos de variables (unión, subconjunto, disjunción) con
+        operaciones enteras de una sola instrucción.
+        """
+        mask = 0
+        for var in self.vars:
+            mask |= 1 << var.index
+        return mask
+
+    @slot_property
+    def consts(self) -> frozenset["Const"]:
         """Conjuento de constantes de una fórmula."""
-        match self:
-            case Var():
-                return set()
-            case Const():
-                return {self}
-            case UnaryOperator():
-                return self.f.consts
-            case BinaryOperator():
-                return self.left.consts.union(self.right.consts)
-            case _:
-                raise ValueError("UNREACHABLE")
+        result: set[Const] = set()
+        stack: list[Formula] = [self]
+        while stack:
+            f = stack.pop()
+            kind = f.kind
+            if kind >= KIND_AND:
+                stack.append(f.left)
+                stack.append(f.right)
+            elif kind == KIND_NEG:
+                stack.append(f.f)
+            elif kind == KIND_CONST:
+                result.add(f)
+        return frozenset(result)
+
+    def to_flat(self) -> tuple[list[int], list[int], list[int]]:
+        """
+        Codificación plana de la fórmula en tres listas paralelas.
+
+        El árbol se aplana en postorden a arrays paralelos `tags`, `lhs`,
+        `rhs`: `tags[i]` es el código del nodo i (ver las constantes FLAT_*),
+        y `lhs[i]`/`rhs[i]` son los índices de sus hijos dentro de los
+        propios arrays (-1 si no existen). Para las variables, `lhs[i]` es
+        el índice de la variable en Var.var_names.
+
+        Los nodos compartidos (misma identidad) se emiten una sola vez, de
+        modo que el resultado es un DAG y no un árbol. Los algoritmos que
+        recorren la fórmula repetidamente (evaluación, comprobación de
+        tautologías) pueden iterar sobre estas listas contiguas en lugar de
+        perseguir punteros de objetos Python.
+
+        Returns:
+            tupla (tags, lhs, rhs); la raíz es la última posición.
+        """
+        tags: list[int] = []
+        lhs: list[int] = []
+        rhs: list[int] = []
+        position: dict[int, int] = {}
+        stack: list[tuple[Formula, bool]] = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in position:
+                continue
+            if expanded:
+                position[id(node)] = len(tags)
+                tags.append(_FLAT_TAGS[node.__class__])
+                if isinstance(node, UnaryOperator):
+                    lhs.append(position[id(node.f)])
+                    rhs.append(-1)
+                else:
+                    lhs.append(position[id(node.left)])
+                    rhs.append(position[id(node.right)])
+            elif isinstance(node, Var):
+                position[id(node)] = len(tags)
+                tags.append(FLAT_VAR)
+                lhs.append(node.index)
+                rhs.append(-1)
+            elif isinstance(node, Const):
+                position[id(node)] = len(tags)
+                tags.append(FLAT_CONST_TRUE if node is Const.TRUE else FLAT_CONST_FALSE)
+                lhs.append(-1)
+                rhs.append(-1)
+            elif isinstance(node, UnaryOperator):
+                stack.append((node, True))
+                stack.append((node.f, False))
+            else:
+                stack.append((node, True))
+                stack.append((node.right, False))
+                stack.append((node.left, False))
+        return tags, lhs, rhs
+
+    def to_array(self) -> FormulaArray:
+        """Codificación plana de la fórmula como FormulaArray."""
+        return FormulaArray(*self.to_flat())
 
     def subs(self, binding: Binding) -> Formula:
         """
@@ -293,15 +477,61 @@ class Formula:
         Returns:
             la nueva fórmula en la que se han sustituido las variables.
         """
+        # Si ninguna variable de la fórmula aparece en el binding, el
+        # resultado es la propia fórmula, sin recorrerla.
+        if self.vars.isdisjoint(binding):
+            return self
+        values: list[Formula] = []
+        stack: list[tuple[Formula, bool]] = [(self, False)]
+        while stack:
+            f, expanded = stack.pop()
+            kind = f.kind
+            if kind >= KIND_AND:
+                if expanded:
+                    right = values.pop()
+                    left = values.pop()
+                    if left is f.left and right is f.right:
+                        values.append(f)
+                    else:
+                        values.append(f.__class__(left, right))
+                else:
+                    stack.append((f, True))
+                    stack.append((f.right, False))
+                    stack.append((f.left, False))
+            elif kind == KIND_NEG:
+                if expanded:
+                    child = values.pop()
+                    values.append(f if child is f.f else f.__class__(child))
+                else:
+                    stack.append((f, True))
+                    stack.append((f.f, False))
+            elif kind == KIND_VAR:
+                values.append(binding.get(f, f))
+            else:
+                values.append(f)
+        return values[0]
+
+    def subs_tuple(self, values: tuple[Formula | None, ...]) -> Formula:
+        """
+        Variante de subs que recibe las sustituciones como una tupla indexada
+        por Var.index (None significa sin sustitución), evitando consultas a
+        un diccionario en el camino caliente de la verificación.
+        """
         match self:
             case Var():
-                return binding[self] if self in binding else self
+                value = values[self.index]
+                return value if value is not None else self
             case Const():
                 return self
             case UnaryOperator(A):
-                return self.__class__(A.subs(binding))
+                A2 = A.subs_tuple(values)
+                return self if A2 is A else self.__class__(A2)
             case BinaryOperator(A, B):
-                return self.__class__(A.subs(binding), B.subs(binding))
+                A2 = A.subs_tuple(values)
+                B2 = B.subs_tuple(values)
+                if A2 is A and B2 is B:
+                    return self
+                return self.__class__(A2, B2)
             case _:
                 raise ValueError("UNREACHABLE")
 
@@ -330,25 +560,25 @@ class Formula:
 
     def traverse_breadth(self) -> Iterator[Formula]:
         """Recorre la fórmula en el orden de anchura primero."""
-        queue = [self]
-        while len(queue) > 0:
-            v = queue.pop()
+        queue = deque([self])
+        while queue:
+            v = queue.popleft()
             yield v
             match v:
                 case Var() | Const():
                     pass
                 case UnaryOperator(A):
-                    queue.insert(0, A)
+                    queue.append(A)
                 case BinaryOperator(A, B):
-                    queue.insert(0, A)
-                    queue.insert(0, B)
+                    queue.append(A)
+                    queue.append(B)
 
     @staticmethod
     def from_traversal_breadth_first(traversal: Iterable[Formula]) -> Formula:
         """Construye una fórmula a partir de un recorrido en anchura primero."""
         traversal = list(traversal)
         assert len(traversal) > 0
-        queue = []
+        queue: deque[Formula] = deque()
         v: Formula = Const.TRUE  # for type checking
         while len(traversal) > 0:
             v = traversal.pop()
@@ -356,11 +586,11 @@ class Formula:
                 case Var() | Const():
                     queue.append(v)
                 case UnaryOperator():
-                    f = queue.pop(0)
+                    f = queue.popleft()
                     queue.append(v.__class__(f))
                 case BinaryOperator():
-                    right = queue.pop(0)
-                    left = queue.pop(0)
+                    right = queue.popleft()
+                    left = queue.popleft()
                     queue.append(v.__class__(left, right))
         return queue.pop()
 
@@ -413,44 +643,52 @@ class Formula:
         Reemplaza la fórmula en una posición determinada por otra fórmula,
         siguiendo el orden de anchura primero.
         """
-        queue = [self]
+        queue: deque[Formula] = deque([self])
         traversal = []
         i = 0
-        while len(queue) > 0:
-            v = queue.pop()
+        while queue:
+            v = queue.popleft()
             if pos == i:
-                queue.append(f)
+                queue.appendleft(f)
             else:
                 traversal.append(v)
                 match v:
                     case Var() | Const():
                         pass
                     case UnaryOperator(A):
-                        queue.insert(0, A)
+                        queue.append(A)
                     case BinaryOperator(A, B):
-                        queue.insert(0, A)
-                        queue.insert(0, B)
+                        queue.append(A)
+                        queue.append(B)
             i += 1
         return Formula.from_traversal_breadth_first(traversal)
 
-    @cached_property
+    @slot_property
     def simp_double_neg(self) -> Formula:
         """
         Fórmula equivalente en la que se han eliminado las dobles negaciones.
         """
+        # En los casos sin reescritura se devuelve self si los hijos no han
+        # cambiado (comprobación de identidad), evitando pasar otra vez por
+        # el pool de interning y generar basura en el punto fijo.
         match self:
             case Var() | Const():
                 return self
             case Neg(Neg(f)):
                 return f.simp_double_neg
             case UnaryOperator(f):
-                return self.__class__(f.simp_double_neg)
+                f2 = f.simp_double_neg
+                return self if f2 is f else self.__class__(f2)
             case BinaryOperator(left, right):
-                return self.__class__(left.simp_double_neg, right.simp_double_neg)
+                left2 = left.simp_double_neg
+                right2 = right.simp_double_neg
+                if left2 is left and right2 is right:
+                    return self
+                return self.__class__(left2, right2)
             case _:
                 raise ValueError("UNREACHABLE")
 
-    @cached_property
+    @slot_property
     def subs_imp(self) -> Formula:
         """
         Fórula equivalente en la que se han eliminado las implicaciones,
@@ -460,15 +698,20 @@ class Formula:
             case Var() | Const():
                 return self
             case UnaryOperator(f):
-                return self.__class__(f.subs_imp)
+                f2 = f.subs_imp
+                return self if f2 is f else self.__class__(f2)
             case Imp(left, right):
                 return Or(Neg(left.subs_imp), right.subs_imp)
             case BinaryOperator(left, right):
-                return self.__class__(left.subs_imp, right.subs_imp)
+                left2 = left.subs_imp
+                right2 = right.subs_imp
+                if left2 is left and right2 is right:
+                    return self
+                return self.__class__(left2, right2)
             case _:
                 raise ValueError("UNREACHABLE")
 
-    @cached_property
+    @slot_property
     def push_neg(self) -> Formula:
         """
         Fórmula eqiuvalente en la que se han empujado todas las negaciones hacia
@@ -488,152 +731,236 @@ class Formula:
             case Neg(Imp(left, right)):
                 return And(left.push_neg, Neg(right).push_neg)
             case BinaryOperator(left, right):
-                return self.__class__(left.push_neg, right.push_neg)
+                left2 = left.push_neg
+                right2 = right.push_neg
+                if left2 is left and right2 is right:
+                    return self
+                return self.__class__(left2, right2)
             case _:
                 raise ValueError("UNREACHABLE")
 
-    @cached_property
+    @slot_property
+    def _nnf(self) -> Formula:
+        """
+        Forma normal negativa: fusiona en un solo recorrido la eliminación de
+        implicaciones (subs_imp) y el empuje de negaciones (push_neg),
+        evitando construir el árbol intermedio que la segunda pasada
+        descartaría. La polaridad negada se calcula con _nnf_neg, de modo que
+        cada nodo cachea ambas polaridades.
+        """
+        match self:
+            case Var() | Const():
+                return self
+            case Neg(f):
+                return f._nnf_neg
+            case Imp(left, right):
+                return Or(left._nnf_neg, right._nnf)
+            case BinaryOperator(left, right):
+                left2 = left._nnf
+                right2 = right._nnf
+                if left2 is left and right2 is right:
+                    return self
+                return self.__class__(left2, right2)
+            case _:
+                raise ValueError("UNREACHABLE")
+
+    @slot_property
+    def _nnf_neg(self) -> Formula:
+        """Forma normal negativa de la negación de la fórmula."""
+        match self:
+            case Var() | Const():
+                return Neg(self)
+            case Neg(f):
+                return f._nnf
+            case And(left, right):
+                return Or(left._nnf_neg, right._nnf_neg)
+            case Or(left, right):
+                return And(left._nnf_neg, right._nnf_neg)
+            case Imp(left, right):
+                return And(left._nnf, right._nnf_neg)
+            case _:
+                raise ValueError("UNREACHABLE")
+
+    @slot_property
     def distribute_or(self) -> Formula:
         """
         Fórmula equivalente en la que se ha aplicado la propiedad distributiva
         de la disyunción.
         """
-        f1, f2 = self, self._distribute_or_step
-        while f2 != f1:
-            f1 = f2
-            f2 = f1._distribute_or_step
-        return f1
+        f, changed = self._distribute_or_step
+        while changed:
+            f, changed = f._distribute_or_step
+        return f
 
-    @cached_property
-    def _distribute_or_step(self) -> Formula:
+    @slot_property
+    def _distribute_or_step(self) -> tuple[Formula, bool]:
+        # El booleano indica si la pasada ha modificado algo; el punto fijo
+        # se detecta con el flag en lugar de comparar fórmulas completas.
         match self:
             case Var() | Const():
-                return self
+                return self, False
             case UnaryOperator(f):
-                return self.__class__(f._distribute_or_step)
+                f2, changed = f._distribute_or_step
+                return (self.__class__(f2), True) if changed else (self, False)
             case Or(And(A, B), C):
-                return And(
-                    Or(A._distribute_or_step, C._distribute_or_step),
-                    Or(B._distribute_or_step, C._distribute_or_step),
-                )
+                A2, _ = A._distribute_or_step
+                B2, _ = B._distribute_or_step
+                C2, _ = C._distribute_or_step
+                return And(Or(A2, C2), Or(B2, C2)), True
             case Or(A, And(B, C)):
-                return And(
-                    Or(A._distribute_or_step, B._distribute_or_step),
-                    Or(A._distribute_or_step, C._distribute_or_step),
-                )
+                A2, _ = A._distribute_or_step
+                B2, _ = B._distribute_or_step
+                C2, _ = C._distribute_or_step
+                return And(Or(A2, B2), Or(A2, C2)), True
             case BinaryOperator(left, right):
-                return self.__class__(
-                    left._distribute_or_step, right._distribute_or_step
-                )
+                left2, changed_left = left._distribute_or_step
+                right2, changed_right = right._distribute_or_step
+                if changed_left or changed_right:
+                    return self.__class__(left2, right2), True
+                return self, False
             case _:
                 raise ValueError("UNREACHABLE")
 
-    @cached_property
+    @slot_property
     def simp_const(self) -> Formula:
         """
         Fórmula equivalente en la que se han eliminado las constantes
         redundantes y simplificado las negaciones de constantes.
         """
-        f1, f2 = self, self._simp_const_step
-        while f2 != f1:
-            f1 = f2
-            f2 = f1._simp_const_step
-        return f1
+        f, changed = self._simp_const_step
+        while changed:
+            f, changed = f._simp_const_step
+        return f
 
-    @cached_property
-    def _simp_const_step(self) -> Formula:
+    @slot_property
+    def _simp_const_step(self) -> tuple[Formula, bool]:
         match self:
             case Var() | Const():
-                return self
+                return self, False
             case Neg(Const.TRUE):
-                return Const.FALSE
+                return Const.FALSE, True
             case Neg(Const.FALSE):
-                return Const.TRUE
+                return Const.TRUE, True
             case Neg(A):
-                return Neg(A._simp_const_step)
+                A2, changed = A._simp_const_step
+                return (Neg(A2), True) if changed else (self, False)
             case And(Const.TRUE, B):
-                return B._simp_const_step
+                return B._simp_const_step[0], True
             case And(A, Const.TRUE):
-                return A._simp_const_step
+                return A._simp_const_step[0], True
             case And(Const.FALSE, _):
-                return Const.FALSE
+                return Const.FALSE, True
             case And(_, Const.FALSE):
-                return Const.FALSE
+                return Const.FALSE, True
             case Or(_, Const.TRUE):
-                return Const.TRUE
+                return Const.TRUE, True
             case Or(Const.TRUE, _):
-                return Const.TRUE
+                return Const.TRUE, True
             case Or(A, Const.FALSE):
-                return A._simp_const_step
+                return A._simp_const_step[0], True
             case Or(Const.FALSE, A):
-                return A._simp_const_step
+                return A._simp_const_step[0], True
             case Imp(Const.TRUE, A):
-                return A._simp_const_step
+                return A._simp_const_step[0], True
             case Imp(_, Const.TRUE):
-                return Const.TRUE
+                return Const.TRUE, True
             case Imp(Const.FALSE, _):
-                return Const.TRUE
+                return Const.TRUE, True
             case Imp(A, Const.FALSE):
-                return Neg(A._simp_const_step)
+                return Neg(A._simp_const_step[0]), True
             case BinaryOperator(A, B):
-                return self.__class__(A._simp_const_step, B._simp_const_step)
+                A2, changed_A = A._simp_const_step
+                B2, changed_B = B._simp_const_step
+                if changed_A or changed_B:
+                    return self.__class__(A2, B2), True
+                return self, False
             case _:
                 raise ValueError("UNREACHABLE")
 
-    @cached_property
+    @slot_property
     def CNF(self) -> Formula:
         """
         Forma normal conjuntiva de la fórmula.
 
         Se calcula aplicando de forma secuencial las siguientes equivalencias:
 
-        - se eliminan todas las implicaciones con `subs_imp`,
-        - se empujan todas las negaciones hacia abajo en el árbol de la fórmula
-          utilizando `push_neg`,
+        - se eliminan las implicaciones y se empujan las negaciones hacia
+          abajo en el árbol en una única pasada fusionada (`_nnf`,
+          equivalente a `subs_imp` seguido de `push_neg`),
         - se aplica la propiedad distributiva de la disyunción con
           `distribute_or`,
         - se eliminan las constantes redundantes con `simp_const`.
         """
-        return self.subs_imp.push_neg.distribute_or.simp_const
+        return self._nnf.distribute_or.simp_const
 
-    @cached_property
+    @slot_property
     def CNF_structured(self) -> list[set[Neg | Var | Const]]:
         """
         Versión estructurada de la CNF.
 
-        Returns: 
+        Se construye recorriendo directamente el árbol de la CNF (las
+        conjunciones separan cláusulas y las disyunciones acumulan
+        literales), sin reconstruir ni reparsear la representación en string.
+
+        Returns:
             lista de conjuntos de fórmulas simples (negaciones de variables, variables o constantes).
         """
-        self = self.CNF
-        result: list[set[Neg | Var | Const]] = list()
-        current_set: set[Neg | Var | Const] = set()
-        i = 0
-        f_str = str(self)
-        while i < len(f_str):
-            if f_str[i] == "¬":
-                i += 1
-                if f_str[i] == "T":
-                    current_set.add(Const.FALSE)
-                elif f_str[i] == "F":
-                    current_set.add(Const.TRUE)
-                else:
-                    current_set.add(Neg(Var(f_str[i])))
-            elif f_str[i] == "∧":
-                result.append(current_set)
-                current_set = set()
-            elif f_str[i] == "∨" or f_str[i] == "(" or f_str[i] == ")":
-                pass
-            else:
-                if f_str[i] == "T":
-                    current_set.add(Const.TRUE)
-                elif f_str[i] == "F":
-                    current_set.add(Const.FALSE)
-                else:
-                    current_set.add(Var(f_str[i]))
-            i += 1
-        result.append(current_set)
+        result: list[set[Neg | Var | Const]] = []
+        conjuncts: list[Formula] = [self.CNF]
+        while conjuncts:
+            f = conjuncts.pop()
+            if isinstance(f, And):
+                conjuncts.append(f.right)
+                conjuncts.append(f.left)
+                continue
+            clause: set[Neg | Var | Const] = set()
+            literals: list[Formula] = [f]
+            while literals:
+                g = literals.pop()
+                match g:
+                    case Or(left, right):
+                        literals.append(right)
+                        literals.append(left)
+                    case Neg(Const.TRUE):
+                        clause.add(Const.FALSE)
+                    case Neg(Const.FALSE):
+                        clause.add(Const.TRUE)
+                    case Neg(Var()) | Var() | Const():
+                        clause.add(g)
+                    case _:
+                        raise ValueError("UNREACHABLE")
+            result.append(clause)
         return result
 
+    @slot_property
+    def CNF_masks(self) -> list[tuple[int, int]]:
+        """
+        Cláusulas de la CNF codificadas como pares de máscaras de bits
+        (positivas, negativas) indexadas por Var.index. Comprobar si una
+        cláusula contiene un par complementario se reduce a un AND entero.
+        La constante T vuelve la cláusula tautológica (se codifica (-1, -1))
+        y la constante F es inerte dentro de una disyunción (se descarta).
+        """
+        masks: list[tuple[int, int]] = []
+        for clause in self.CNF_structured:
+            pos = neg = 0
+            tauto = False
+            for f in clause:
+                match f:
+                    case Const.TRUE:
+                        tauto = True
+                        break
+                    case Const.FALSE:
+                        pass
+                    case Neg(g):
+                        neg |= 1 << g.index
+                    case Var():
+                        pos |= 1 << f.index
+                    case _:
+                        raise ValueError("UNREACHABLE")
+            masks.append((-1, -1) if tauto else (pos, neg))
+        return masks
+
     @staticmethod
     def print_CNF_structured(cnf: list[set[Formula]]) -> str:
         """
@@ -644,28 +971,54 @@ class Formula:
             [f"({'∨'.join([ str(e) for e in list(disj)])})" for disj in cnf]
         )
 
-    @cached_property
+    @slot_property
     def is_tauto(self) -> bool:
         """
-        Determina si una fórmula es una tautología en base a su CNF.
+        Determina si una fórmula es una tautología.
+
+        Con pocas variables (el caso habitual) se evalúan todas las
+        asignaciones de golpe, en paralelo a nivel de bit, sobre la
+        codificación plana (ver FormulaArray.evaluate_all); solo si hay
+        demasiadas variables se recurre al método basado en la CNF.
         """
-        for l in self.CNF_structured:
-            affirmative, negative = set(), set()
-            for f in l:
-                match f:
-                    case Const.TRUE:
-                        return True
-                    case Const.FALSE:
-                        return False
-                    case Neg(f):
-                        negative.add(f)
-                    case Var():
-                        affirmative.add(f)
-                    case _:
-                        raise ValueError("UNREACHABLE")
-            if len(affirmative.intersection(negative)) == 0:
+        if len(self.vars) <= _TAUTO_BITS_MAX_VARS:
+            result, full = self.to_array().evaluate_all()
+            return result == full
+        # La fórmula es tautología si toda cláusula de su CNF lo es: dos ANDs
+        # enteros por cláusula sobre las máscaras de literales.
+        return all(pos & neg != 0 for pos, neg in self.CNF_masks)
+
+    def is_tauto_dpll(self) -> bool:
+        """
+        Determina si la fórmula es una tautología por división sobre las
+        variables (estilo DPLL), sin construir la CNF: se sustituye una
+        variable por T y por F, se simplifican las constantes y se recurre.
+
+        Las subfórmulas ya decididas se memoizan; gracias al hash-consing
+        la clave es el propio nodo compartido, de modo que la estructura
+        repetida se decide una sola vez.
+        """
+        cache: dict[Formula, bool] = {}
+
+        def rec(f: Formula) -> bool:
+            if f is Const.TRUE:
+                return True
+            if f is Const.FALSE:
                 return False
-        return True
+            if f in cache:
+                return cache[f]
+            if f.vars:
+                v = next(iter(f.vars))
+                result = rec(f.subs({v: Const.TRUE}).simp_const) and rec(
+                    f.subs({v: Const.FALSE}).simp_const
+                )
+            else:
+                # Sin variables, simp_const reduce la fórmula a una constante.
+                result = f.simp_const is Const.TRUE
+            cache[f] = result
+            return result
+
+        return rec(self.simp_const)
 
 
 # Tipo auxiliar para representar una fórmula o una lista de fórmulas.
@@ -677,24 +1030,49 @@ def formulas_to_list(fs: Formulas) -> list[Formula]:
     return [fs] if isinstance(fs, Formula) else fs
 
 
+# Pool global de hash-consing para los operadores: fórmulas estructuralmente
+# iguales comparten una única instancia (las variables y constantes ya son
+# singletons por su cuenta). Las referencias son débiles, de modo que las
+# fórmulas que dejan de usarse se liberan con normalidad.
+_intern_pool: "WeakValueDictionary[tuple, Formula]" = WeakValueDictionary()
+
+
 class UnaryOperator(Formula):
     """
 
     Los operadores unarios son aquellos que tienen una única fórmula como
     argumento.
     """
+
+    __slots__ = ("f", "_repr", "_str_polish", "__weakref__")
     symbol: str
     __match_args__ = ("f",)
 
-    def __init__(self, f: Formula) -> None:
-        self.f = f
+    def __new__(cls, f: Formula):
+        # Hash-consing: como los hijos están a su vez internados, la clave
+        # por identidad del hijo basta para compartir subfórmulas iguales.
+        # Todo el estado se construye aquí, una única vez por nodo: las
+        # representaciones se componen de las de los hijos, ya cacheadas.
+        key = (cls, id(f))
+        cached = _intern_pool.get(key)
+        if cached is None:
+            cached = super().__new__(cls)
+            cached.f = f
+            cached._sig = hash((cls.__name__, f._sig))
+            cached._repr = f"{cls.symbol}{f!r}"
+            cached._str_polish = f"{cls.symbol} {f.str_polish}"
+            _intern_pool[key] = cached
+        return cached
+
+    def __reduce__(self):
+        return (self.__class__, (self.f,))
 
     def __repr__(self):
-        return f"{self.symbol}{self.f}"
+        return self._repr
 
     @property
     def str_polish(self) -> str:
-        return f"{self.symbol} {self.f.str_polish}"
+        return self._str_polish
 
     def semantics(self, value: bool) -> bool:
         raise NotImplementedError()
@@ -705,18 +1083,31 @@ class BinaryOperator(Formula):
     Los operadores binarios son aquellos que tienen dos fórmulas como argumento.
     """
 
+    __slots__ = ("left", "right", "_repr", "_str_polish", "__weakref__")
     symbol: str
     __match_args__ = ("left", "right")
 
-    def __init__(self, left: Formula, right: Formula):
-        self.left, self.right = left, right
+    def __new__(cls, left: Formula, right: Formula):
+        key = (cls, id(left), id(right))
+        cached = _intern_pool.get(key)
+        if cached is None:
+            cached = super().__new__(cls)
+            cached.left, cached.right = left, right
+            cached._sig = hash((cls.__name__, left._sig, right._sig))
+            cached._repr = f"({left!r}{cls.symbol}{right!r})"
+            cached._str_polish = f"{cls.symbol} {left.str_polish} {right.str_polish}"
+            _intern_pool[key] = cached
+        return cached
+
+    def __reduce__(self):
+        return (self.__class__, (self.left, self.right))
 
     def __repr__(self):
-        return f"({self.left}{self.symbol}{self.right})"
+        return self._repr
 
     @property
     def str_polish(self) -> str:
-        return f"{self.symbol} {self.left.str_polish} {self.right.str_polish}"
+        return self._str_polish
 
     def semantics(self, left_value: bool, right_value: bool) -> bool:
         raise NotImplementedError()
@@ -728,11 +1119,55 @@ class Var(Formula):
     tomar valores semánticos de verdadero o falso.
     """
 
+    __slots__ = ("value", "index")
+
+    kind = KIND_VAR
+
     var_names = "ABCDEGHIJKLMNOPQRSVWXYZ"
 
-    def __init__(self, name: str):
-        assert name in Var.var_names, "Nombre de variable inválido"
-        self.value = name
+    # Índice O(1) de nombre de variable a posición en var_names, en lugar de
+    # validar con un escaneo lineal de la string y otro para el índice.
+    _NAME_TO_IDX = {name: i for i, name in enumerate(var_names)}
+
+    # Las variables se internan: cada nombre tiene una única instancia, de
+    # modo que la igualdad y el hash se reducen a identidad de punteros. Las
+    # instancias son inmutables (no debe mutarse value tras la construcción).
+    # Todo el estado se asigna en __new__ al fallar el pool, de forma que un
+    # acierto devuelve la instancia sin reasignar nada.
+    _pool: dict[str, "Var"] = {}
+
+    def __new__(cls, name: str):
+        var = cls._pool.get(name)
+        if var is None:
+            index = cls._NAME_TO_IDX.get(name)
+            assert index is not None, "Nombre de variable inválido"
+            var = super().__new__(cls)
+            var.value = name
+            var.index = index
+            var._sig = hash(("Var", name))
+            cls._pool[name] = var
+        return var
+
+    def __reduce__(self):
+        return (Var, (self.value,))
+
+    def __len__(self) -> int:
+        return 1
+
+    @slot_property
+    def vars(self) -> frozenset[Var]:
+        return frozenset((self,))
+
+    @slot_property
+    def vars_mask(self) -> int:
+        return 1 << self.index
+
+    @slot_property
+    def consts(self) -> frozenset[Const]:
+        return frozenset()
+
+    def subs(self, binding: Binding) -> Formula:
+        return binding.get(self, self)
 
     def __repr__(self):
         return self.value
@@ -766,19 +1201,55 @@ class Const(Formula, Enum):
     FALSE = 0
     TRUE = 1
 
+    def __len__(self) -> int:
+        return 1
+
+    @slot_property
+    def vars(self) -> frozenset[Var]:
+        return frozenset()
+
+    @slot_property
+    def vars_mask(self) -> int:
+        return 0
+
+    @slot_property
+    def consts(self) -> frozenset["Const"]:
+        return frozenset((self,))
+
+    def subs(self, binding: Binding) -> Formula:
+        return self
+
     def __repr__(self):
         return "F" if self.name == "FALSE" else "T"
 
+    # Enum.__str__ devuelve "Const.TRUE", lo que rompía las representaciones
+    # compuestas (str_polish y las infijas) y su round-trip por parse_polish.
+    __str__ = __repr__
+
     @property
     def str_polish(self):
         return str(self)
 
 
+# Los miembros de un Enum no pasan por Formula.__init__, así que la firma
+# estructural se asigna tras definir la clase.
+for _const in Const:
+    _const._sig = hash(("Const", _const.name))
+del _const
+# Asignar `kind` dentro del cuerpo del Enum crearía un alias del miembro de
+# valor 1, así que se asigna también tras definir la clase.
+Const.kind = KIND_CONST
+
+
 class Neg(UnaryOperator):
     """
     Neg es el operador unario de negación.
     """
 
+    __slots__ = ()
+
+    kind = KIND_NEG
+
     symbol = "¬"
 
     def semantics(self, value: bool) -> bool:
@@ -790,6 +1261,10 @@ class And(BinaryOperator):
     And es el operador binario de conjunción.
     """
 
+    __slots__ = ()
+
+    kind = KIND_AND
+
     symbol = "∧"
 
     def semantics(self, left_value: bool, right_value: bool) -> bool:
@@ -797,10 +1272,14 @@ class And(BinaryOperator):
 
 
 class Or(BinaryOperator):
-    """ 
+    """
     Or es el operador binario de disyunción.
     """
 
+    __slots__ = ()
+
+    kind = KIND_OR
+
     symbol = "∨"
 
     def semantics(self, left_value: bool, right_value: bool) -> bool:
@@ -812,6 +1291,10 @@ class Imp(BinaryOperator):
     Imp es el operador binario de implicación.
     """
 
+    __slots__ = ()
+
+    kind = KIND_IMP
+
     symbol = "→"
 
     def semantics(self, left_value: bool, right_value: bool) -> bool:
@@ -820,3 +1303,202 @@ class Imp(BinaryOperator):
 
 unary_operators: list[type[Neg]] = [Neg]
 binary_operators: list[type[And] | type[Or] | type[Imp]] = [And, Or, Imp]
+
+# Códigos de nodo de la codificación plana de fórmulas (ver Formula.to_flat)
+FLAT_VAR = 0
+FLAT_CONST_FALSE = 1
+FLAT_CONST_TRUE = 2
+FLAT_NEG = 3
+FLAT_AND = 4
+FLAT_OR = 5
+FLAT_IMP = 6
+
+_FLAT_TAGS: dict[type, int] = {Neg: FLAT_NEG, And: FLAT_AND, Or: FLAT_OR, Imp: FLAT_IMP}
+
+# Número máximo de variables para el que is_tauto usa la evaluación
+# bit-paralela exhaustiva (2^n bits por entero) antes de caer a la CNF.
+_TAUTO_BITS_MAX_VARS = 20
+
+
+class FormulaArray:
+    """
+    Vista SoA (struct of arrays) de una fórmula: las tres listas paralelas de
+    enteros que produce Formula.to_flat. Las pasadas por lotes (tamaño,
+    variables, evaluación) iteran sobre listas contiguas de ints con un
+    bucle plano, en lugar de recorrer nodos Python enlazados por punteros.
+    """
+
+    __slots__ = ("tags", "lhs", "rhs")
+
+    def __init__(self, tags: list[int], lhs: list[int], rhs: list[int]) -> None:
+        self.tags = tags
+        self.lhs = lhs
+        self.rhs = rhs
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    @property
+    def var_indices(self) -> frozenset[int]:
+        """Índices en Var.var_names de las variables de la fórmula."""
+        tags, lhs = self.tags, self.lhs
+        return frozenset(lhs[i] for i in range(len(tags)) if tags[i] == FLAT_VAR)
+
+    def evaluate(self, assignment: dict[int, bool]) -> bool:
+        """
+        Evalúa la fórmula con una asignación (índice de variable -> booleano)
+        en una única pasada en postorden sobre los arrays.
+        """
+        tags, lhs, rhs = self.tags, self.lhs, self.rhs
+        values = [False] * len(tags)
+        for i, tag in enumerate(tags):
+            if tag == FLAT_VAR:
+                values[i] = assignment[lhs[i]]
+            elif tag == FLAT_CONST_TRUE:
+                values[i] = True
+            elif tag == FLAT_CONST_FALSE:
+                values[i] = False
+            elif tag == FLAT_NEG:
+                values[i] = not values[lhs[i]]
+            elif tag == FLAT_AND:
+                values[i] = values[lhs[i]] and values[rhs[i]]
+            elif tag == FLAT_OR:
+                values[i] = values[lhs[i]] or values[rhs[i]]
+            else:
+                values[i] = not values[lhs[i]] or values[rhs[i]]
+        return values[-1]
+
+    def _run_bits(self, masks: dict[int, int], full: int) -> int:
+        """
+        Núcleo SWAR: ejecuta el programa en postorden con un entero por
+        subfórmula, donde cada bit es el valor bajo una asignación del lote.
+        """
+        tags, lhs, rhs = self.tags, self.lhs, self.rhs
+        values = [0] * len(tags)
+        for i, tag in enumerate(tags):
+            if tag == FLAT_VAR:
+                values[i] = masks[lhs[i]]
+            elif tag == FLAT_CONST_TRUE:
+                values[i] = full
+            elif tag == FLAT_CONST_FALSE:
+                values[i] = 0
+            elif tag == FLAT_NEG:
+                values[i] = full ^ values[lhs[i]]
+            elif tag == FLAT_AND:
+                values[i] = values[lhs[i]] & values[rhs[i]]
+            elif tag == FLAT_OR:
+                values[i] = values[lhs[i]] | values[rhs[i]]
+            else:
+                values[i] = (full ^ values[lhs[i]]) | values[rhs[i]]
+        return values[-1]
+
+    def evaluate_all(self) -> tuple[int, int]:
+        """
+        Evalúa la fórmula sobre las 2^n asignaciones a la vez, en paralelo a
+        nivel de bit: cada valor intermedio es un entero de 2^n bits cuyo
+        bit j es el valor de la subfórmula bajo la asignación j (el bit p de
+        j da el valor de la p-ésima variable en orden de índice).
+
+        Returns:
+            tupla (resultado, full), donde full es la máscara con los 2^n
+            bits a uno; la fórmula es una tautología si resultado == full.
+        """
+        indices = sorted(self.var_indices)
+        total = 1 << len(indices)
+        full = (1 << total) - 1
+        masks: dict[int, int] = {}
+        for p, index in enumerate(indices):
+            block = (1 << (1 << p)) - 1
+            repeat = full // ((1 << (2 << p)) - 1)
+            masks[index] = repeat * (block << (1 << p))
+        return self._run_bits(masks, full), full
+
+    def evaluate_batch(self, assignments: list[dict[int, bool]]) -> list[bool]:
+        """
+        Evalúa la fórmula sobre un lote de asignaciones arbitrarias con una
+        única pasada bit-paralela: la asignación j ocupa el bit j de cada
+        valor intermedio, así que cada operación entera evalúa el lote
+        entero de golpe en lugar de recorrer el árbol una vez por asignación.
+
+        Args:
+            assignments: lista de asignaciones (índice de variable -> bool).
+
+        Returns:
+            lista con el valor de la fórmula bajo cada asignación.
+        """
+        n = len(assignments)
+        full = (1 << n) - 1
+        masks: dict[int, int] = {}
+        for index in self.var_indices:
+            mask = 0
+            for j, assignment in enumerate(assignments):
+                if assignment[index]:
+                    mask |= 1 << j
+            masks[index] = mask
+        result = self._run_bits(masks, full)
+        return [bool(result >> j & 1) for j in range(n)]
+
+
+@lru_cache(maxsize=32)
+def _ordered_vars(n: int) -> tuple[Var, ...]:
+    """
+    Las n primeras variables en orden alfabético, memoizadas: los generadores
+    aleatorios piden esta lista una vez por hoja.
+    """
+    return tuple(map(Var, Var.var_names[:n]))
+
+
+# Tabla de despacho de parse_polish: símbolo -> (aridad, constructor o valor).
+# Pertenencia O(1) para validar nombres de variable al parsear, en lugar de
+# recorrer la cadena Var.var_names en cada carácter.
+_VAR_NAME_SET = frozenset(Var.var_names)
+
+_POLISH_DISPATCH: dict[str, tuple[int, Any]] = {
+    Neg.symbol: (1, Neg),
+    And.symbol: (2, And),
+    Or.symbol: (2, Or),
+    Imp.symbol: (2, Imp),
+    "T": (0, Const.TRUE),
+    "F": (0, Const.FALSE),
+}
+
+
+def _compile_subs(f: Formula) -> Callable[[tuple[Formula | None, ...]], Formula]:
+    match f:
+        case Var():
+            index = f.index
+
+            def subs_var(
+                values: tuple[Formula | None, ...], i: int = index, default: Formula = f
+            ) -> Formula:
+                value = values[i]
+                return value if value is not None else default
+
+            return subs_var
+        case Const():
+            return lambda values, const=f: const
+        case UnaryOperator(a):
+            return lambda values, cls=f.__class__, ca=_compile_subs(a): cls(ca(values))
+        case BinaryOperator(a, b):
+            return lambda values, cls=f.__class__, ca=_compile_subs(
+                a
+            ), cb=_compile_subs(b): cls(ca(values), cb(values))
+        case _:
+            raise ValueError("UNREACHABLE")
+
+
+_compiled_subs: dict[Formula, Callable[[tuple[Formula | None, ...]], Formula]] = {}
+
+
+def compile_subs(f: Formula) -> Callable[[tuple[Formula | None, ...]], Formula]:
+    """
+    Especializa subs_tuple para una fórmula fija (p. ej. un axioma): devuelve
+    un callable que reconstruye la fórmula enchufando las sustituciones en
+    las hojas, sin volver a recorrer ni inspeccionar el árbol original. El
+    resultado se memoiza por fórmula.
+    """
+    compiled = _compiled_subs.get(f)
+    if compiled is None:
+        compiled = _compile_subs(f)
+        _compiled_subs[f] = compiled
+    return compiled
@@ -17,8 +17,10 @@ A, B, C = Var.generate(3)
 
 
 class PCProof(Proof):
+    __slots__ = ()
+
     MP = InferenceRule("MP", [A, A >> B], B)
-    axioms: list[Formula] = [
+    AXIOMS: list[Formula] = [
         B >> (A >> B),
         (A >> (B >> C)) >> ((A >> B) >> (A >> C)),
         (~B >> ~A) >> ((~B >> A) >> B),
@@ -32,7 +34,7 @@ class PCProof(Proof):
     ):
         super(PCProof, self).__init__(
             {PCProof.MP},
-            PCProof.axioms,
+            PCProof.AXIOMS,
             assumptions,
             conclusion,
             steps,
@@ -41,7 +43,7 @@ class PCProof(Proof):
     @staticmethod
     def from_proof(proof: Proof) -> PCProof:
         assert proof.rules == {PCProof.MP}
-        assert proof.axioms == PCProof.axioms
+        assert proof.axioms == PCProof.AXIOMS
         return PCProof(proof.assumptions, proof.conclusion, proof.steps)
 
 
@@ -81,30 +83,55 @@ def f_implies_f_proof(f: Formula, assumptions: list[Formula]):
 
 
 def assumption_to_implication(proof: PCProof, assumption: Formula) -> PCProof:
-    match assumption_to_implication_case(proof, assumption):
+    # Los pasos compartidos por varios modus ponens se transforman una única
+    # vez: la recursión trabaja sobre los índices de la demostración original
+    # y memoiza por índice la subdemostración ya transformada, evitando el
+    # coste exponencial de revisitar los mismos subárboles de MP.
+    return _assumption_to_implication(proof, assumption, len(proof.steps) - 1, {})
+
+
+def _assumption_to_implication(
+    proof: PCProof,
+    assumption: Formula,
+    index: int,
+    transformed: dict[int, PCProof],
+) -> PCProof:
+    cached = transformed.get(index)
+    if cached is not None:
+        return cached
+    sub = PCProof.from_proof(proof.step_subproof(index))
+    match assumption_to_implication_case(sub, assumption):
         case 1:
-            proof = PCProof.from_proof(proof.delete_superflous_assumptions())
-            proof.steps.append(AxS(0, {A: assumption, B: proof.conclusion}))
-            i = len(proof.steps)
-            proof.steps.append(MP(i - 2, i - 1))
-            proof.conclusion = assumption >> proof.conclusion
-            return proof
+            # Se construye una demostración nueva en lugar de mutar steps y
+            # conclusion de la recién creada: las demostraciones se tratan
+            # como inmutables para que sus cachés (state, deps_table, ...)
+            # sigan siendo válidas.
+            base = sub.delete_superflous_assumptions()
+            i = len(base.steps) + 1
+            result = PCProof(
+                base.assumptions,
+                assumption >> base.conclusion,
+                [
+                    *base.steps,
+                    AxS(0, {A: assumption, B: base.conclusion}),
+                    MP(i - 2, i - 1),
+                ],
+            )
 
         case 2:
             assert (
-                isinstance(proof.conclusion, Imp)
-                and proof.conclusion.right == assumption
+                isinstance(sub.conclusion, Imp) and sub.conclusion.right == assumption
             )
-            assumptions = proof.assumptions.copy()
+            assumptions = sub.assumptions.copy()
             assumptions.remove(assumption)
-            return PCProof(
+            result = PCProof(
                 assumptions,
-                assumption >> proof.conclusion,
-                [AxS(0, {A: proof.conclusion.left, B: assumption})],
+                assumption >> sub.conclusion,
+                [AxS(0, {A: sub.conclusion.left, B: assumption})],
             )
 
         case 3:
-            last_step = proof.steps[-1]
+            last_step = proof.steps[index]
             assert isinstance(last_step, RuleApplication) and last_step.rule == MP
             i1, i2 = last_step.assumption_indices
             # TODO: Aqui i1 i2 pueden ser indices correspondientes a
@@ -125,9 +152,7 @@ def assumption_to_implication(proof: PCProof, assumption: Formula) -> PCProof:
                         f, proof.assumptions
                     ).delete_superflous_assumptions()
             else:
-                p1 = assumption_to_implication(
-                    PCProof.from_proof(proof.step_subproof(i1)), assumption
-                )
+                p1 = _assumption_to_implication(proof, assumption, i1, transformed)
             if isinstance(proof.steps[i2], AssumptionInclusion):
                 f: Formula = proof.assumptions[proof.steps[i2].index]
                 if f == assumption:
@@ -137,15 +162,16 @@ def assumption_to_implication(proof: PCProof, assumption: Formula) -> PCProof:
                         f, proof.assumptions
                     ).delete_superflous_assumptions()
             else:
-                p2 = assumption_to_implication(
-                    PCProof.from_proof(proof.step_subproof(i2)), assumption
-                )
+                p2 = _assumption_to_implication(proof, assumption, i2, transformed)
             assumptions, steps = proof_mixer(p1, p2)
             assert isinstance(p1.conclusion, Imp)
             steps.append(
-                AxS(1, {A: assumption, B: p1.conclusion.right, C: proof.conclusion})
+                AxS(1, {A: assumption, B: p1.conclusion.right, C: sub.conclusion})
             )
             proof_len = len(steps)
             steps.append(PCProof.MP(proof_len - 2, proof_len - 1))
             steps.append(PCProof.MP(len(p1.steps) - 1, proof_len))
-            return PCProof(assumptions, assumption >> proof.conclusion, steps)
+            result = PCProof(assumptions, assumption >> sub.conclusion, steps)
+
+    transformed[index] = result
+    return result
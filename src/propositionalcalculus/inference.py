@@ -1,31 +1,85 @@
 from __future__ import annotations
-from functools import cached_property, reduce
-from copy import copy
+from collections.abc import Callable, Iterator
+from types import MappingProxyType
 
 from rich.table import Table
 from rich.padding import Padding
 from rich.panel import Panel
 
 
-from .rule import pattern_match
+from .rule import match_top
+from .sat import is_tauto_sat
 from .formula import (
     Binding,
     Formula,
     Const,
     Formulas,
     Var,
+    compile_subs,
     formulas_to_list,
     merge_bindings,
 )
 
 
+# Memoización de comprobaciones de corrección entre reglas α-equivalentes:
+# dos reglas con la misma estructura salvo renombrado de variables comparten
+# una única comprobación de tautología.
+_SOUND_MEMO: dict[str, bool] = {}
+
+
+def _soundness_key(assumptions: list[Formula], conclusion: Formula) -> str:
+    """
+    Serializa (premisas, conclusión) renombrando las variables en orden de
+    primera aparición, de forma que reglas α-equivalentes produzcan la misma
+    clave.
+    """
+    rename: dict[str, str] = {}
+    parts = []
+    for f in [*assumptions, conclusion]:
+        chars = []
+        for node in f.traverse_preorder():
+            if isinstance(node, Var):
+                canonical = rename.get(node.value)
+                if canonical is None:
+                    canonical = Var.var_names[len(rename)]
+                    rename[node.value] = canonical
+                chars.append(canonical)
+            elif isinstance(node, Const):
+                chars.append(repr(node))
+            else:
+                chars.append(node.symbol)
+        parts.append("".join(chars))
+    return "|".join(parts)
+
+
+def _iter_bits(mask: int) -> Iterator[int]:
+    """Itera los índices de los bits activos de una máscara, en orden ascendente."""
+    while mask:
+        yield (mask & -mask).bit_length() - 1
+        mask &= mask - 1
+
+
 class InferenceRule:
     """
     Reglas de inferencia.
 
     Una regla de inferencia consiste de una serie de premisas de las cuales se
-    puede derivar una conclusión. 
+    puede derivar una conclusión.
     """
+
+    __slots__ = (
+        "_name",
+        "_assumptions",
+        "_conclusion",
+        "_vars_per_assumption",
+        "_arity",
+        "_assumptions_vars",
+        "_conclusion_vars",
+        "_free_conclusion_vars",
+        "_is_sound",
+        "_hash",
+    )
+
     def __init__(
         self,
         name: str,
@@ -42,13 +96,32 @@ class InferenceRule:
         self._name = name
         self._assumptions = formulas_to_list(assumptions)
         self._conclusion = conclusion
+        # Variables de cada premisa, congeladas una única vez. Cuando una
+        # premisa no comparte variables con las anteriores, apply puede
+        # saltarse la comprobación de conflictos de merge_bindings.
+        self._vars_per_assumption = [frozenset(a.vars) for a in self._assumptions]
+        self._arity = len(self._assumptions)
+        # Los conjuntos de variables se calculan de forma ansiosa: los .vars
+        # por nodo ya están cacheados, así que congelarlos aquí es barato y
+        # apply se ahorra la diferencia de conjuntos en cada aplicación.
+        self._assumptions_vars: frozenset[Var] = frozenset().union(
+            *self._vars_per_assumption
+        )
+        self._conclusion_vars: frozenset[Var] = self._conclusion.vars
+        self._free_conclusion_vars: frozenset[Var] = (
+            self._conclusion_vars - self._assumptions_vars
+        )
+        self._is_sound: bool | None = None
+        # El hash se precalcula una vez: las reglas circulan por conjuntos
+        # (Proof.rules) y cada comprobación de pertenencia lo necesitaba.
+        self._hash = hash((name, tuple(self._assumptions), conclusion))
 
     def __repr__(self) -> str:
         return f"<InferenceRule {self._name}>"
 
     @property
     def name(self) -> str:
-        return self.name
+        return self._name
 
     def __str__(self) -> str:
         assumptions = ", ".join(map(str, self._assumptions))
@@ -58,11 +131,7 @@ class InferenceRule:
 
     def __hash__(self) -> int:
         # TODO: Decide how to define equality and hash
-        return (
-            hash(self._name)
-            + sum(hash(a) for a in self._assumptions)
-            + hash(self._conclusion)
-        )
+        return self._hash
 
     def __eq__(self, other: InferenceRule) -> bool:
         # TODO: Decide how to define equality and hash
@@ -72,32 +141,38 @@ class InferenceRule:
             and self._conclusion == other._conclusion
         )
 
-    @cached_property
+    @property
     def arity(self) -> int:
         """El número de premisas de la regla de inferencia"""
-        return len(self._assumptions)
+        return self._arity
 
-    @cached_property
-    def assumptions_vars(self) -> set[Var]:
+    @property
+    def assumptions_vars(self) -> frozenset[Var]:
         """Conjunto de variables presentes en las premisas de la regla"""
-        return set().union(*[a.vars for a in self._assumptions])
+        return self._assumptions_vars
 
-    @cached_property
-    def conclusion_vars(self) -> set[Var]:
+    @property
+    def conclusion_vars(self) -> frozenset[Var]:
         """Cojunto de variables presentes en la conclusión de la regla"""
-        return self._conclusion.vars
+        return self._conclusion_vars
 
-    @cached_property
+    @property
     def is_sound(self) -> bool:
         """
-        Determina si la regla de inferencia es cohrente con la semántica de 
+        Determina si la regla de inferencia es cohrente con la semántica de
         la lógica proposicional.
         """
-        f = Const.TRUE
-        for assumption in self._assumptions:
-            f = f & assumption
-        f = f >> self._conclusion
-        return f.is_tauto
+        if self._is_sound is None:
+            key = _soundness_key(self._assumptions, self._conclusion)
+            cached = _SOUND_MEMO.get(key)
+            if cached is None:
+                f = Const.TRUE
+                for assumption in self._assumptions:
+                    f = f & assumption
+                f = f >> self._conclusion
+                cached = _SOUND_MEMO[key] = is_tauto_sat(f)
+            self._is_sound = cached
+        return self._is_sound
 
     def apply(
         self,
@@ -105,8 +180,8 @@ class InferenceRule:
         conclusion_binding: Binding | None = None,
     ) -> Formula | None:
         """
-        La aplicación de la regla consiste en, dadas unas premisas concretas con 
-        la forma (mismo patrón) de las premisas abstractas de la regla, obtener 
+        La aplicación de la regla consiste en, dadas unas premisas concretas con
+        la forma (mismo patrón) de las premisas abstractas de la regla, obtener
         una conclusión concreta donde se han efectuado las sustituciones a
         partir del reconocimiento de los patrones en las premisas.
 
@@ -134,18 +209,23 @@ class InferenceRule:
             return None
         if conclusion_binding is None:
             conclusion_binding = dict()
-        if self.conclusion_vars.difference(self.assumptions_vars) != set(
-            conclusion_binding.keys()
-        ):
+        if self._free_conclusion_vars != conclusion_binding.keys():
             return None
         global_binding = conclusion_binding.copy()
-        for gen_assumption, spec_assumption in zip(self._assumptions, assumptions):
-            binding = next(pattern_match(gen_assumption, spec_assumption))
+        prior_vars: frozenset[Var] = frozenset(conclusion_binding.keys())
+        for gen_assumption, assumption_vars, spec_assumption in zip(
+            self._assumptions, self._vars_per_assumption, assumptions
+        ):
+            binding = match_top(gen_assumption, spec_assumption)
             if binding is None:
                 return None
-            global_binding = merge_bindings(global_binding, binding)
-            if global_binding is None:
-                return None
+            if prior_vars.isdisjoint(assumption_vars):
+                global_binding.update(binding)
+            else:
+                global_binding = merge_bindings(global_binding, binding)
+                if global_binding is None:
+                    return None
+            prior_vars |= assumption_vars
         return self._conclusion.subs(global_binding)
 
     def __call__(self, *assumption_indices: int) -> RuleApplication:
@@ -157,7 +237,7 @@ class InferenceRule:
         correspondiente a la aplicación de la regla de inferencia, sin tener que
         instanciar la clase RuleApplication directamente.
         """
-        return RuleApplication(self, list(assumption_indices))
+        return RuleApplication(self, assumption_indices)
 
     def specialize(self, binding: dict[Var, Formula]) -> InferenceRule:
         """
@@ -181,7 +261,7 @@ class InferenceRule:
         Args:
             other: regla a comparar.
 
-        Returns: 
+        Returns:
             True si la regla es una especialización de la otra regla, False en caso contrario.
         """
         if len(self._assumptions) != len(other._assumptions):
@@ -192,7 +272,7 @@ class InferenceRule:
         other_fs = list(other._assumptions) + [other._conclusion]
 
         for self_f, other_f in zip(self_fs, other_fs):
-            binding = next(pattern_match(other_f, self_f))
+            binding = match_top(other_f, self_f)
             if binding is None:
                 return False
             global_binding = merge_bindings(global_binding, binding)
@@ -203,9 +283,23 @@ class InferenceRule:
 
 class Proof:
     """
-    Una demostración es una secuencia de pasos. 
+    Una demostración es una secuencia de pasos.
     Cada paso es una instancia del tipo ProofStep.
     """
+
+    __slots__ = (
+        "rules",
+        "axioms",
+        "assumptions",
+        "conclusion",
+        "steps",
+        "_state",
+        "_check",
+        "_used_assumptions",
+        "_used_assumptions_set",
+        "_deps_table",
+    )
+
     def __init__(
         self,
         rules: set[InferenceRule],
@@ -234,10 +328,40 @@ class Proof:
         assert all(
             [s.rule in self.rules for s in self.steps if isinstance(s, RuleApplication)]
         ), "All RuleApplication steps must use rules explicitly declared in the proof rules"
+        self._state: list[Formula | None] | None = None
+        self._check: bool | None = None
+        self._used_assumptions: list[Formula] | None = None
+        self._used_assumptions_set: frozenset[Formula] | None = None
+        self._deps_table: list[int] | None = None
 
     def __repr__(self):
         return f"{', '.join(map(str, self.assumptions))} ⊢ {self.conclusion}"
 
+    @property
+    def deps_table(self) -> list[int]:
+        """
+        Tabla de dependencias de la demostración: la posición i contiene una
+        máscara de bits con los índices de los pasos de los que depende el
+        paso i (directa o transitivamente; el bit j está activo si el paso i
+        depende del paso j). Se construye en una única pasada lineal sobre
+        los pasos (los índices de una aplicación de regla siempre apuntan
+        hacia atrás) y se cachea. La unión de dependencias es un OR entero
+        en lugar de una unión de conjuntos, y la tabla entera es una lista
+        de ints.
+        """
+        if self._deps_table is None:
+            table: list[int] = []
+            for step in self.steps:
+                if isinstance(step, RuleApplication):
+                    mask = 0
+                    for i in step.assumption_indices:
+                        mask |= (1 << i) | table[i]
+                    table.append(mask)
+                else:
+                    table.append(0)
+            self._deps_table = table
+        return self._deps_table
+
     def step_dependencies(self, index: int) -> set[int]:
         """
         Devuelve el conjunto de índices de los pasos de los que depende el
@@ -246,16 +370,10 @@ class Proof:
         Args:
             index: Índice del paso.
 
-        Returns: 
+        Returns:
             Conjunto de índices de los pasos de los que depende el paso.
         """
-        match self.steps[index]:
-            case RuleApplication(_, indices):
-                return reduce(
-                    set.union, [self.step_dependencies(i) for i in indices]
-                ).union(set(indices))
-            case _:
-                return set()
+        return set(_iter_bits(self.deps_table[index]))
 
     def step_subproof(
         self, index: int, delete_superflous_assumptions: bool = False
@@ -268,13 +386,13 @@ class Proof:
             index: Índice del paso.
             delete_superflous_assumptions: Si es True, se eliminan las asunciones superfluas.
 
-        Returns: 
+        Returns:
             Subdemostración.
         """
         new_conclusion = self.state[index]
         assert new_conclusion is not None
-        steps_indices = list(self.step_dependencies(index)) + [index]
-        steps_indices.sort()
+        # Los bits de la máscara se extraen ya en orden ascendente.
+        steps_indices = list(_iter_bits(self.deps_table[index] | (1 << index)))
         if delete_superflous_assumptions:
             assumptions = []
         else:
@@ -284,20 +402,25 @@ class Proof:
         steps_reindex: dict[int, int] = dict()
         for i_new, i_old in enumerate(steps_indices):
             steps_reindex[i_old] = i_new
-            match self.steps[i_old]:
-                case AssumptionInclusion(i) as f:
-                    if delete_superflous_assumptions:
-                        assumptions.append(self.assumptions[i])
-                        if i not in assumptions_reindex:
-                            assumptions_reindex[i] = len(assumptions) - 1
-                        steps.append(AssumptionInclusion(assumptions_reindex[i]))
-                    else:
-                        steps.append(f)
-                case AxiomSpecialization() as f:
-                    steps.append(f)
-                case RuleApplication(rule, assumption_indices) as f:
-                    new_indices = [steps_reindex[i] for i in assumption_indices]
-                    steps.append(RuleApplication(rule, new_indices))
+            step = self.steps[i_old]
+            if isinstance(step, AssumptionInclusion):
+                if delete_superflous_assumptions:
+                    i = step.index
+                    assumptions.append(self.assumptions[i])
+                    if i not in assumptions_reindex:
+                        assumptions_reindex[i] = len(assumptions) - 1
+                    steps.append(AssumptionInclusion(assumptions_reindex[i]))
+                else:
+                    steps.append(step)
+            elif isinstance(step, RuleApplication):
+                steps.append(
+                    RuleApplication._unchecked(
+                        step.rule,
+                        tuple(steps_reindex[i] for i in step.assumption_indices),
+                    )
+                )
+            else:
+                steps.append(step)
         return Proof(
             self.rules.copy(),
             self.axioms.copy(),
@@ -306,7 +429,7 @@ class Proof:
             steps,
         )
 
-    @cached_property
+    @property
     def state(self) -> list[Formula | None]:
         """
         Itera por todos los pasos de la demostración y va aplicando los pasos,
@@ -318,26 +441,25 @@ class Proof:
         Returns:
             Lista de fórmulas que representan el estado de la demostración.
         """
-        state = []
-        for step in self.steps:
-            match step:
-                case AssumptionInclusion():
-                    state.append(step.apply(self.assumptions))
-                case AxiomSpecialization():
-                    state.append(step.apply(self.axioms))
-                case RuleApplication():
-                    state.append(step.apply(state))
-            if state[-1] is None:
-                break
-        return state
-
-    @cached_property
+        if self._state is None:
+            state: list[Formula | None] = []
+            dispatch = _STATE_DISPATCH
+            for step in self.steps:
+                state.append(dispatch[step.__class__](step, self, state))
+                if state[-1] is None:
+                    break
+            self._state = state
+        return self._state
+
+    @property
     def check(self) -> bool:
         """
         Comprueba si la demostración es correcta, es decir, si la última fórmula
         de la lista de estados es la conclusión de la demostración.
         """
-        return self.state[-1] == self.conclusion
+        if self._check is None:
+            self._check = self.state[-1] == self.conclusion
+        return self._check
 
     def display(self, highlight_rule: int | None = None):
         """
@@ -385,20 +507,31 @@ class Proof:
             expand=False,
         )
 
-    @cached_property
+    @property
     def used_assumptions(self) -> list[Formula]:
         """Lista de asunciones usadas en la demostración"""
-        result = []
-        for step in self.steps:
-            if isinstance(step, AssumptionInclusion):
-                ass = step.apply(self.assumptions)
-                if ass is not None:
-                    result.append(ass)
-        return result
+        if self._used_assumptions is None:
+            result = []
+            for step in self.steps:
+                if isinstance(step, AssumptionInclusion):
+                    ass = step.apply(self.assumptions)
+                    if ass is not None:
+                        result.append(ass)
+            self._used_assumptions = result
+        return self._used_assumptions
 
     def superflous_assumption(self, assumption: Formula) -> bool:
-        """Determina si una premisa es superflua"""
-        return assumption not in self.used_assumptions
+        """
+        Determina si una premisa es superflua.
+
+        La pertenencia se comprueba contra un frozenset cacheado de las
+        premisas usadas (O(1) con las fórmulas internadas), en lugar de
+        escanear la lista en cada llamada; assumption_to_implication lo
+        consulta en cada paso de su recursión.
+        """
+        if self._used_assumptions_set is None:
+            self._used_assumptions_set = frozenset(self.used_assumptions)
+        return assumption not in self._used_assumptions_set
 
     def delete_superflous_assumptions(self) -> Proof:
         """
@@ -424,31 +557,38 @@ def proof_mixer(proof1: Proof, proof2: Proof) -> tuple[list[Formula], list[Proof
     # and adding proof2 assumptions not in proof1.
 
     assumptions = proof1.assumptions.copy()
-    reindex_assumptions_proof2: dict[int, int] = dict()
-    ass_not_in_proof1 = 0
-    for i_old, assumption in enumerate(proof2.assumptions):
-        if assumption not in assumptions:
-            reindex_assumptions_proof2[i_old] = len(assumptions)
+    # Índice premisa → posición construido una sola vez: con las fórmulas
+    # internadas la búsqueda es un acceso de diccionario, en lugar del par
+    # `in` + `index` que escaneaba la lista dos veces por premisa de proof2.
+    assumption_idx: dict[Formula, int] = {a: i for i, a in enumerate(assumptions)}
+    # La tabla de reindexado es una lista contigua indexada por la posición
+    # antigua, en lugar de un diccionario int → int.
+    reindex_assumptions_proof2: list[int] = []
+    for assumption in proof2.assumptions:
+        idx = assumption_idx.get(assumption)
+        if idx is None:
+            idx = assumption_idx[assumption] = len(assumptions)
             assumptions.append(assumption)
-            ass_not_in_proof1 += 1
-        else:
-            reindex_assumptions_proof2[i_old] = assumptions.index(assumption)
-
-    # Mixing proof steps
-    # First we add proof1 steps
-    steps: list[ProofStep] = proof1.steps.copy()
-
-    # Then we add proof2 steps
+        reindex_assumptions_proof2.append(idx)
+
+    # Mixing proof steps: proof1 steps followed by proof2 steps reindexed.
+    # Los pasos son inmutables, así que cuando el reindexado no cambia nada
+    # (posición de premisa estable, o pad nulo) se reutiliza el paso
+    # original en lugar de reconstruirlo.
+    pad = len(proof1.steps)
+    mixed: list[ProofStep] = []
     for step in proof2.steps:
-        match step:
-            case AssumptionInclusion(i):
-                steps.append(AssumptionInclusion(reindex_assumptions_proof2[i]))
-            case RuleApplication():
-                steps.append(step.pad(len(proof1.steps)))
-            case _:
-                steps.append(step)
+        if isinstance(step, AssumptionInclusion):
+            new_index = reindex_assumptions_proof2[step.index]
+            mixed.append(
+                step if new_index == step.index else AssumptionInclusion(new_index)
+            )
+        elif isinstance(step, RuleApplication):
+            mixed.append(step if pad == 0 else step.pad(pad))
+        else:
+            mixed.append(step)
 
-    return assumptions, steps
+    return assumptions, proof1.steps + mixed
 
 
 class AssumptionInclusion:
@@ -456,6 +596,8 @@ class AssumptionInclusion:
     Tipo de paso de una demostración que consiste en incluir una de las premisas
     de la demostración para ser utilizada.
     """
+
+    __slots__ = ("index",)
     __match_args__ = ("index",)
 
     def __init__(self, index: int):
@@ -472,17 +614,53 @@ class AssumptionInclusion:
 Ass = AssumptionInclusion
 
 
+# Pool de bindings compartidos entre especializaciones de axiomas. Bindings
+# como {A: A, B: A} se repiten constantemente al construir demostraciones,
+# así que se congelan y se comparte una única instancia inmutable.
+_binding_pool: dict[frozenset, Binding] = {}
+
+
+def _freeze_binding(binding: Binding) -> Binding:
+    key = frozenset(binding.items())
+    cached = _binding_pool.get(key)
+    if cached is None:
+        cached = MappingProxyType(dict(binding))
+        _binding_pool[key] = cached
+    return cached
+
+
 class AxiomSpecialization:
     """
     Tipo de paso de una demostración que consiste en incluir un axioma de la
     teoría en el que se ha realizado una sustitución arbitraria
     (especialización) mediante un binding.
     """
+
+    __slots__ = (
+        "axiom_index",
+        "binding",
+        "_subs_vector",
+        "_cached_axiom",
+        "_cached_result",
+    )
     __match_args__ = ("axiom_index", "binding")
 
     def __init__(self, axiom_index: int, binding: Binding) -> None:
         self.axiom_index = axiom_index
-        self.binding = binding
+        self.binding = _freeze_binding(binding)
+        # La sustitución se precalcula como tupla indexada por Var.index,
+        # para que apply no tenga que consultar un diccionario por variable.
+        vector: list[Formula | None] = [None] * (
+            1 + max((v.index for v in self.binding), default=-1)
+        )
+        for var, formula in self.binding.items():
+            vector[var.index] = formula
+        self._subs_vector = tuple(vector)
+        # Resultado de la última aplicación, junto al axioma del que salió:
+        # el mismo paso se aplica repetidamente con la misma lista de
+        # axiomas al verificar y extraer subdemostraciones.
+        self._cached_axiom: Formula | None = None
+        self._cached_result: Formula | None = None
 
     def __repr__(self):
         return f"Ax {self.axiom_index} {self.binding}"
@@ -490,8 +668,13 @@ class AxiomSpecialization:
     def apply(self, axioms: list[Formula]) -> Formula | None:
         if 0 <= self.axiom_index < len(axioms):
             axiom = axioms[self.axiom_index]
+            if axiom is self._cached_axiom:
+                return self._cached_result
             if set(self.binding.keys()) == axiom.vars:
-                return axiom.subs(self.binding)
+                result = compile_subs(axiom)(self._subs_vector)
+                self._cached_axiom = axiom
+                self._cached_result = result
+                return result
 
 
 AxS = AxiomSpecialization
@@ -502,28 +685,87 @@ class RuleApplication:
     Tipo de paso de una demostración que consiste en aplicar una regla de
     inferencia del sistema deductivo que se esté considerando.
     """
+
+    __slots__ = ("rule", "assumption_indices", "_i0", "_i1")
     __match_args__ = ("rule", "assumption_indices")
 
-    def __init__(self, rule: InferenceRule, assumption_indices: list[int]) -> None:
+    def __init__(
+        self, rule: InferenceRule, assumption_indices: list[int] | tuple[int, ...]
+    ) -> None:
         assert rule.arity == len(
             assumption_indices
         ), f"La cantidad de premisas debe coincidir con la aridad de la regla."
         self.rule = rule
-        self.assumption_indices = assumption_indices
+        # Tupla en lugar de lista: inmutable y más compacta; una
+        # demostración larga guarda un par de índices por paso.
+        self.assumption_indices = tuple(assumption_indices)
+        # Prácticamente todas las reglas tienen aridad 1 o 2 (MP siempre 2);
+        # se guardan los índices desempaquetados para que apply no tenga que
+        # construir una lista intermedia en el caso común.
+        if rule.arity == 1:
+            self._i0 = assumption_indices[0]
+            self._i1 = -1
+        elif rule.arity == 2:
+            self._i0, self._i1 = assumption_indices
+        else:
+            self._i0 = self._i1 = -1
+
+    @classmethod
+    def _unchecked(
+        cls, rule: InferenceRule, assumption_indices: tuple[int, ...]
+    ) -> RuleApplication:
+        """
+        Constructor interno que omite la aserción de aridad, para los caminos
+        calientes que solo reindexan pasos ya validados (pad y la extracción
+        de subdemostraciones). La validación pública sigue en __init__.
+        """
+        step = object.__new__(cls)
+        step.rule = rule
+        step.assumption_indices = assumption_indices
+        n = len(assumption_indices)
+        if n == 1:
+            step._i0 = assumption_indices[0]
+            step._i1 = -1
+        elif n == 2:
+            step._i0, step._i1 = assumption_indices
+        else:
+            step._i0 = step._i1 = -1
+        return step
 
     def __repr__(self):
         return f"{self.rule._name} {', '.join(map(str, self.assumption_indices))}"
 
     def pad(self, pad: int) -> RuleApplication:
-        return RuleApplication(
-            copy(self.rule), [i + pad for i in self.assumption_indices]
+        # La regla es inmutable y se comparte por identidad: copiarla por
+        # paso solo encarecía la comprobación `step.rule in rules`.
+        return RuleApplication._unchecked(
+            self.rule, tuple(i + pad for i in self.assumption_indices)
         )
 
     def apply(self, state: list[Formula]) -> Formula | None:
+        n = len(state)
+        arity = self.rule.arity
+        if arity == 2:
+            if self._i0 >= n or self._i1 >= n:
+                return None
+            return self.rule.apply((state[self._i0], state[self._i1]))
+        if arity == 1:
+            if self._i0 >= n:
+                return None
+            return self.rule.apply((state[self._i0],))
         for i in self.assumption_indices:
-            if i + 1 > len(state):
+            if i + 1 > n:
                 return None
         return self.rule.apply([state[index] for index in self.assumption_indices])
 
 
 ProofStep = AssumptionInclusion | AxiomSpecialization | RuleApplication
+
+# Tabla de despacho del bucle interno de Proof.state: cada tipo de paso se
+# resuelve con una única búsqueda por type(step), en lugar de una cadena de
+# isinstance por paso. El manejador decide contra qué lista se aplica el paso.
+_STATE_DISPATCH: dict[type, Callable[..., Formula | None]] = {
+    AssumptionInclusion: lambda step, proof, state: step.apply(proof.assumptions),
+    AxiomSpecialization: lambda step, proof, state: step.apply(proof.axioms),
+    RuleApplication: lambda step, proof, state: step.apply(state),
+}
@@ -3,12 +3,10 @@ from functools import wraps
 from pathlib import Path
 from typing import Any
 
-from tree_sitter import Language, Node, Parser
-
-from propositionalcalculus.inference import InferenceRule
-
-# from propositionalcalculus.inference import InferenceRule
+from tree_sitter import Language, Node, Parser, Tree
 
+from . import parser_cache
+from .inference import InferenceRule
 from .formula import (
     And,
     Const,
@@ -22,92 +20,189 @@ from .formula import (
 PATH = Path(__file__).parent
 PARSER_LIB = "grammar/build/parser.so"
 
-Language.build_library(PARSER_LIB, ["grammar"])
+
+def _build_parser_lib() -> None:
+    """
+    Compila la gramática solo si la librería no existe o alguna fuente de la
+    gramática es más reciente, evitando invocar el compilador de C en cada
+    import.
+    """
+    lib = Path(PARSER_LIB)
+    if lib.exists():
+        newest = max(
+            (
+                p.stat().st_mtime
+                for ext in ("*.js", "*.c")
+                for p in Path("grammar").rglob(ext)
+            ),
+            default=0.0,
+        )
+        if newest <= lib.stat().st_mtime:
+            return
+    Language.build_library(PARSER_LIB, ["grammar"])
+
+
+_build_parser_lib()
 
 TSLANG = Language(PARSER_LIB, "propositionalcalculus")
 
+# La query se compila una sola vez al importar el módulo; antes se releía y
+# recompilaba el fichero .scm en cada llamada a parse_formulas/parse_rules.
+_QUERY = TSLANG.query((PATH / "../../grammar/queries/python-bindings.scm").read_text())
+
+
+_BINARY_NODES: dict[str, type[Formula]] = {"and": And, "or": Or, "imp": Imp}
+
 
 def parse_formula(node: Node) -> Formula:
-    match node.type:
-        case "formula":
-            return parse_formula(node.children[0])
-        case "var":
-            return Var(node.text.decode())
-        case "const":
-            match node.text.decode():
-                case "T":
-                    return Const.TRUE
-                case "F":
-                    return Const.FALSE
-                case _:
-                    raise ValueError("Unreachable")
-        case "neg":
-            assert len(node.children) == 2, f"{node.children}"
-            return Neg(parse_formula(node.children[1]))
-        case "and":
-            f1 = node.child_by_field_name("left")
-            f2 = node.child_by_field_name("right")
-            assert f1 is not None and f2 is not None
-            return And(parse_formula(f1), parse_formula(f2))
-        case "or":
-            f1 = node.child_by_field_name("left")
-            f2 = node.child_by_field_name("right")
-            assert f1 is not None and f2 is not None
-            return Or(parse_formula(f1), parse_formula(f2))
-        case "imp":
-            f1 = node.child_by_field_name("left")
-            f2 = node.child_by_field_name("right")
-            assert f1 is not None and f2 is not None
-            return Imp(parse_formula(f1), parse_formula(f2))
-        case "(":
-            raise NotImplementedError()
-        case ")":
-            raise NotImplementedError()
-        case _:
-            raise ValueError(f"Unreachable: {node.type = }")
+    """
+    Construye una fórmula a partir de un nodo del AST de tree-sitter,
+    mediante un recorrido en postorden iterativo con una pila de valores
+    (sin recursión, para soportar fórmulas muy anidadas).
+    """
+    values: list[Formula] = []
+    stack: list[tuple[Node, bool]] = [(node, False)]
+    while stack:
+        node, expanded = stack.pop()
+        match node.type:
+            case "formula":
+                stack.append((node.children[0], False))
+            case "var":
+                values.append(Var(node.text.decode()))
+            case "const":
+                match node.text.decode():
+                    case "T":
+                        values.append(Const.TRUE)
+                    case "F":
+                        values.append(Const.FALSE)
+                    case _:
+                        raise ValueError("Unreachable")
+            case "neg":
+                if expanded:
+                    values.append(Neg(values.pop()))
+                else:
+                    assert len(node.children) == 2, f"{node.children}"
+                    stack.append((node, True))
+                    stack.append((node.children[1], False))
+            case "and" | "or" | "imp":
+                if expanded:
+                    f2 = values.pop()
+                    f1 = values.pop()
+                    values.append(_BINARY_NODES[node.type](f1, f2))
+                else:
+                    f1 = node.child_by_field_name("left")
+                    f2 = node.child_by_field_name("right")
+                    assert f1 is not None and f2 is not None
+                    stack.append((node, True))
+                    stack.append((f2, False))
+                    stack.append((f1, False))
+            case "(":
+                raise NotImplementedError()
+            case ")":
+                raise NotImplementedError()
+            case _:
+                raise ValueError(f"Unreachable: {node.type = }")
+    assert len(values) == 1
+    return values[0]
 
 
 def parse_rule(node: Node):
     id = node.child_by_field_name("id")
     assert id is not None
     id = id.text.decode()
-    assumptions = list(
-        map(
-            lambda n: parse_formula(n),
-            filter(
-                lambda n: n.type == "formula",
-                node.children_by_field_name("assumptions"),
-            ),
-        )
-    )
+    assumptions = [
+        parse_formula(n)
+        for n in node.children_by_field_name("assumptions")
+        if n.type == "formula"
+    ]
     conclusion = node.child_by_field_name("conclusion")
     assert conclusion is not None
     conclusion = parse_formula(conclusion)
     return InferenceRule(id, assumptions, conclusion)
 
 
+class ParserSession:
+    """
+    Sesión de parseo incremental sobre un conjunto de ficheros abiertos.
+
+    Mantiene el último árbol y contenido de cada ruta (hasta MAX_TREES), de
+    modo que tras una edición puntual el árbol anterior puede reutilizarse
+    con la API incremental de tree-sitter en lugar de reparsear en frío.
+    """
+
+    MAX_TREES = 10
+
+    def __init__(self, parser: Parser):
+        self.parser = parser
+        self._trees: dict[str, tuple[Tree, bytes]] = {}
+
+    def _remember(self, path: str, tree: Tree, source: bytes) -> None:
+        self._trees.pop(path, None)
+        self._trees[path] = (tree, source)
+        while len(self._trees) > ParserSession.MAX_TREES:
+            self._trees.pop(next(iter(self._trees)))
+
+    def parse(self, path: str, source: bytes) -> Tree:
+        """
+        Parsea un fichero, reutilizando el árbol cacheado si el contenido no
+        ha cambiado desde el último parseo.
+        """
+        cached = self._trees.get(path)
+        if cached is not None and cached[1] == source:
+            return cached[0]
+        tree = self.parser.parse(source)
+        self._remember(path, tree, source)
+        return tree
+
+    def reparse(self, path: str, new_source: bytes, edits: list[dict]) -> Tree:
+        """
+        Reparsea un fichero tras una lista de ediciones.
+
+        Cada edición es un dict con los argumentos de Tree.edit (start_byte,
+        old_end_byte, new_end_byte, start_point, old_end_point,
+        new_end_point). Si la ruta no está en la sesión se parsea en frío.
+        """
+        cached = self._trees.get(path)
+        if cached is None:
+            tree = self.parser.parse(new_source)
+        else:
+            old_tree = cached[0]
+            for edit in edits:
+                old_tree.edit(**edit)
+            tree = self.parser.parse(new_source, old_tree)
+        self._remember(path, tree, new_source)
+        return tree
+
+
 def file_parser(fn: Callable[[list[tuple[Node, str]]], Any]):
     @wraps(fn)
-    def result(parser: Parser, path: str):
+    def result(parser: Parser, path: str, session: ParserSession | None = None):
         with open(PATH / path, "rb") as f:
-            tree = parser.parse(f.read())
-        with open(PATH / "../../grammar/queries/python-bindings.scm", "r") as f:
-            query = TSLANG.query(f.read())
+            source = f.read()
+        # parse_formulas y parse_rules comparten decorador: la identidad de la
+        # función forma parte de la clave para que un mismo fichero no devuelva
+        # el resultado cacheado del otro parser.
+        key = f"{fn.__qualname__}:{path}"
+        cached = parser_cache.load(key, source)
+        if cached is not None:
+            return cached
+        tree = (
+            session.parse(path, source) if session is not None else parser.parse(source)
+        )
 
-        captures: list[tuple[Node, str]] = query.captures(tree.root_node)
-        return fn(captures)
+        captures: list[tuple[Node, str]] = _QUERY.captures(tree.root_node)
+        value = list(fn(captures))
+        parser_cache.store(key, source, value)
+        return value
 
     return result
 
 
 @file_parser
 def parse_formulas(captures: list[tuple[Node, str]]):
-    return map(
-        lambda e: parse_formula(e[0]),
-        filter(lambda e: e[1] == "formula", captures),
-    )
+    return (parse_formula(node) for node, name in captures if name == "formula")
 
 
 @file_parser
 def parse_rules(captures: list[tuple[Node, str]]):
-    return map(lambda e: parse_rule(e[0]), filter(lambda e: e[1] == "rule", captures))
+    return (parse_rule(node) for node, name in captures if name == "rule")
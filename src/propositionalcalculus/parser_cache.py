@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pickle
+import sqlite3
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+# Caché persistente de resultados de parseo, indexada por (clave, sha256 del
+# contenido), donde la clave identifica la función de parseo y la ruta del
+# fichero. La invalidación es automática: si el fichero cambia, cambia su
+# hash y la entrada antigua simplemente deja de consultarse.
+CACHE_PATH = Path.home() / ".cache" / "propositionalcalculus" / "ast.sqlite"
+
+_connection: sqlite3.Connection | None = None
+
+
+def _connect() -> sqlite3.Connection:
+    global _connection
+    if _connection is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _connection = sqlite3.connect(CACHE_PATH)
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS ast "
+            "(path TEXT, sha BLOB, data BLOB, PRIMARY KEY (path, sha))"
+        )
+    return _connection
+
+
+def load(path: str, source: bytes) -> Any | None:
+    """
+    Busca en la caché el resultado de parsear un fichero.
+
+    Args:
+        path: clave de la entrada (función de parseo y ruta del fichero).
+        source: contenido del fichero.
+
+    Returns:
+        el resultado cacheado, o None si no hay entrada para este contenido.
+    """
+    row = (
+        _connect()
+        .execute(
+            "SELECT data FROM ast WHERE path = ? AND sha = ?",
+            (path, sha256(source).digest()),
+        )
+        .fetchone()
+    )
+    return pickle.loads(row[0]) if row is not None else None
+
+
+def store(path: str, source: bytes, value: Any) -> None:
+    """
+    Guarda en la caché el resultado de parsear un fichero.
+
+    Args:
+        path: clave de la entrada (función de parseo y ruta del fichero).
+        source: contenido del fichero.
+        value: resultado del parseo (debe ser serializable con pickle).
+    """
+    connection = _connect()
+    connection.execute(
+        "INSERT OR REPLACE INTO ast (path, sha, data) VALUES (?, ?, ?)",
+        (path, sha256(source).digest(), pickle.dumps(value, protocol=5)),
+    )
+    connection.commit()
@@ -8,6 +8,83 @@ from networkx import DiGraph, NetworkXNoCycle, find_cycle
 from .formula import Formula, Var, Const, UnaryOperator, BinaryOperator, OrderType
 
 
+# Memoización de match_top. Al verificar demostraciones los mismos pares
+# (patrón, fórmula) se repiten constantemente (los patrones de los axiomas y
+# de las reglas son pocos y fijos), y como las fórmulas están internadas e
+# inmutables el par es una clave válida indefinidamente. El binding se guarda
+# congelado como tupla de pares y se reconstruye el dict al devolverlo, para
+# que las mutaciones del llamante no contaminen la caché. La caché se vacía
+# al alcanzar un tope para acotar la memoria retenida.
+_MATCH_MEMO: dict[tuple[Formula, Formula], tuple[tuple[Var, Formula], ...] | None] = {}
+_MATCH_MEMO_MAX = 1 << 15
+
+
+def match_top(pattern: Formula, subject: Formula) -> dict[Var, Formula] | None:
+    """
+    Reconocimiento de patrones únicamente en la raíz de la fórmula.
+
+    A diferencia de pattern_match, no se recorren las subfórmulas: o el
+    patrón encaja con la fórmula completa o no hay binding. Es la operación
+    que necesitan los llamantes que solo quieren el binding del primer nivel,
+    sin pagar el coste del recorrido. Los resultados se memoizan por pareja
+    de fórmulas.
+
+    Args:
+        pattern: el patrón a buscar
+        subject: la fórmula contra la que se compara el patrón
+
+    Returns:
+        el binding si el patrón encaja con la fórmula, None en caso contrario.
+    """
+    key = (pattern, subject)
+    cached = _MATCH_MEMO.get(key, False)
+    if cached is not False:
+        return None if cached is None else dict(cached)
+    result = _match_iter(pattern, subject)
+    if len(_MATCH_MEMO) >= _MATCH_MEMO_MAX:
+        _MATCH_MEMO.clear()
+    _MATCH_MEMO[key] = None if result is None else tuple(result.items())
+    return result
+
+
+def _match_iter(pattern: Formula, value: Formula) -> dict[Var, Formula] | None:
+    """
+    Versión iterativa del reconocimiento de patrones sobre la raíz.
+
+    Se mantiene una pila explícita de pares (patrón, fórmula) pendientes de
+    comparar, en lugar de recursión: evita el coste de un frame de Python por
+    nodo y el límite de recursión en fórmulas profundas. En cuanto un par no
+    encaja se devuelve None sin seguir recorriendo.
+    """
+    bindings: dict[Var, Formula] = {}
+    stack = [(pattern, value)]
+    while stack:
+        p, v = stack.pop()
+        # Rechazo rápido: un patrón sin variables solo puede encajar con
+        # una fórmula estructuralmente idéntica (misma firma).
+        if p._sig != v._sig and not p.vars:
+            return None
+        if isinstance(p, Var):
+            bound = bindings.get(p)
+            if bound is None:
+                bindings[p] = v
+            elif bound._sig != v._sig or bound != v:
+                return None
+        elif isinstance(p, BinaryOperator):
+            if p.__class__ is not v.__class__:
+                return None
+            stack.append((p.right, v.right))
+            stack.append((p.left, v.left))
+        elif isinstance(p, UnaryOperator):
+            if p.__class__ is not v.__class__:
+                return None
+            stack.append((p.f, v.f))
+        # Const: los miembros de un Enum son singletons.
+        elif p is not v:
+            return None
+    return bindings
+
+
 def pattern_match(
     pattern: Formula,
     subject: Formula,
@@ -22,46 +99,78 @@ def pattern_match(
     recorrido de fórmula particular.
 
     Args:
-        pattern: el patrón a buscar 
+        pattern: el patrón a buscar
         subject: la fórmula en la que busca el patrón
         traverse_order: el tipo de recorrido
 
-    Returns: 
+    Returns:
         un iterador que devuelve el binding asociado a cada posición, si se ha encontrado el patrón, o None en caso contrario.
     """
+    for subformula in subject.traverse(traverse_order):
+        yield _match_iter(pattern, subformula)
 
-    def _match_inner(
-        current_pattern: Formula, value: Formula, bindings: dict[Var, Formula]
-    ) -> bool:
-        match (current_pattern, value):
-            case (Const.TRUE, Const.TRUE):
-                return True
-            case (Const.FALSE, Const.FALSE):
-                return True
-            case (Var() as v, _):
-                if not v in bindings:
-                    bindings[v] = value
-                elif bindings[v] != value:
-                    return False
-                return True
-            case (UnaryOperator(A), UnaryOperator(B)):
-                if current_pattern.__class__ != value.__class__:
-                    return False
-                return _match_inner(A, B, bindings)
-            case (BinaryOperator(A, B), BinaryOperator(C, D)):
-                if current_pattern.__class__ != value.__class__:
-                    return False
-                return _match_inner(A, C, bindings) and _match_inner(B, D, bindings)
-            case _:
-                return False
 
-    for subformula in subject.traverse(traverse_order):
-        assert isinstance(subformula, Formula)
-        bindings: dict[Var, Formula] = {}
-        if _match_inner(pattern, subformula, bindings):
-            yield bindings
+def compile_pattern(pattern: Formula) -> tuple:
+    """
+    Compila un patrón a un programa plano de opcodes.
+
+    El patrón de una regla es fijo desde su construcción, así que en lugar de
+    volver a interpretarlo nodo a nodo en cada match, se aplana una única vez
+    a una secuencia de instrucciones (tag, argumento) en preorden:
+
+    - (0, v): ligar o comprobar la variable v
+    - (1, c): exigir la constante c
+    - (2, cls): exigir un operador unario de clase cls
+    - (3, cls): exigir un operador binario de clase cls
+    """
+    ops = []
+    stack = [pattern]
+    while stack:
+        p = stack.pop()
+        if isinstance(p, Var):
+            ops.append((0, p))
+        elif isinstance(p, Const):
+            ops.append((1, p))
+        elif isinstance(p, UnaryOperator):
+            ops.append((2, p.__class__))
+            stack.append(p.f)
         else:
-            yield None
+            ops.append((3, p.__class__))
+            stack.append(p.right)
+            stack.append(p.left)
+    return tuple(ops)
+
+
+def run_pattern(program: tuple, value: Formula) -> dict[Var, Formula] | None:
+    """
+    Ejecuta un programa generado por compile_pattern contra una fórmula.
+
+    Returns:
+        el binding si el patrón compilado encaja con la fórmula, None en caso
+        contrario.
+    """
+    bindings: dict[Var, Formula] = {}
+    stack = [value]
+    for tag, arg in program:
+        v = stack.pop()
+        if tag == 0:
+            bound = bindings.get(arg)
+            if bound is None:
+                bindings[arg] = v
+            elif bound._sig != v._sig or bound != v:
+                return None
+        elif tag == 3:
+            if v.__class__ is not arg:
+                return None
+            stack.append(v.right)
+            stack.append(v.left)
+        elif tag == 2:
+            if v.__class__ is not arg:
+                return None
+            stack.append(v.f)
+        elif v is not arg:
+            return None
+    return bindings
 
 
 class Rule:
@@ -74,15 +183,16 @@ class Rule:
     """
 
     def __init__(self, head: Formula, body: Formula):
-        """ 
+        """
         Args:
             head: cabecera de la regla (patrón que se va a sustituir)
             body: cuerpo de la regla (por lo que se va a sustituir)
         """
         self.head = head
         self.body = body
-        assert self.body.vars.issubset(
-            self.head.vars
+        self._program = compile_pattern(head)
+        assert (
+            self.body.vars_mask & ~self.head.vars_mask == 0
         ), "Las variables del cuerpo de la regla deben aparecer en la cabecera"
 
     def __str__(self) -> str:
@@ -116,7 +226,7 @@ class Rule:
     ) -> Iterator[dict[Var, Formula] | None]:
         """
         Búsqueda de ocurrencias del patrón de la cabecera en una fórmula dada.
-        
+
         Args:
             value: fórmula en la que se busca el patrón
             traverse_order: tipo de recorrido
@@ -124,7 +234,9 @@ class Rule:
         Returns:
             el iterador devuelto por el proceso de reconocimiento de patrones.
         """
-        return pattern_match(self.head, value, traverse_order)
+        program = self._program
+        for subformula in value.traverse(traverse_order):
+            yield run_pattern(program, subformula)
 
     def apply(
         self,
@@ -210,9 +322,10 @@ class Rule:
 
         Args:
             rules: lista de reglas
-        Returns: 
+        Returns:
             función que dada una fórmula deveulve la fórmula resultante de aplicar todas las reglas de la lista a la fórmula.
         """
+
         def f(value: Formula):
             result = value
             while True:
@@ -231,6 +344,7 @@ class Rule:
         Implementación alternativa de la función apply_list_f, que aplica las
         reglas en un orden distinto, sin utilizar apply_all.
         """
+
         def f(value: Formula):
             result = value
             while True:
@@ -258,12 +372,11 @@ class Rule:
             rules: lista de reglas
             value: fórmula a la que aplicar las reglas
 
-        Returns: 
+        Returns:
             fórmula resultante de aplicar todas las reglas a la fórmula
         """
         return Rule.apply_list_f(rules)(value)
 
-
     def applications(
         self, value: Formula, traverse_order: OrderType = OrderType.BREADTH_FIRST
     ) -> list[Formula]:
@@ -291,7 +404,7 @@ class Rule:
         Args:
             rules: lista de reglas
 
-        Returns: 
+        Returns:
             True si hay ciclos, False en caso contrario.
         """
         G = DiGraph()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from .formula import BinaryOperator, Const, Formula, Imp, Neg, Or, Var
+
+# Una cláusula es una lista de literales enteros estilo DIMACS: el entero i
+# representa la variable i y -i su negación. Las variables se numeran a
+# partir de 1.
+Clause = list[int]
+
+
+def tseitin_clauses(f: Formula) -> tuple[list[Clause], int]:
+    """
+    Transformación de Tseitin de una fórmula a CNF ecuisatisfacible.
+
+    A cada subfórmula se le asigna una variable auxiliar y se emiten las
+    cláusulas que codifican la equivalencia entre la variable y el conector.
+    A diferencia de la CNF por distributividad, el número de cláusulas es
+    lineal en el tamaño de la fórmula.
+
+    Args:
+        f: fórmula a transformar.
+
+    Returns:
+        tupla con la lista de cláusulas y el literal que representa la raíz
+        de la fórmula (sin asertar).
+    """
+    clauses: list[Clause] = []
+    lits: dict[Formula, int] = {}
+
+    def lit(g: Formula) -> int:
+        v = lits.get(g)
+        if v is not None:
+            return v
+        v = len(lits) + 1
+        lits[g] = v
+        match g:
+            case Var():
+                pass
+            case Const.TRUE:
+                clauses.append([v])
+            case Const.FALSE:
+                clauses.append([-v])
+            case Neg(a):
+                la = lit(a)
+                clauses.append([-v, -la])
+                clauses.append([v, la])
+            case Imp(a, b):
+                la, lb = lit(a), lit(b)
+                clauses.append([v, la])
+                clauses.append([v, -lb])
+                clauses.append([-v, -la, lb])
+            case Or(a, b):
+                la, lb = lit(a), lit(b)
+                clauses.append([-la, v])
+                clauses.append([-lb, v])
+                clauses.append([-v, la, lb])
+            case BinaryOperator(a, b):  # And
+                la, lb = lit(a), lit(b)
+                clauses.append([-v, la])
+                clauses.append([-v, lb])
+                clauses.append([-la, -lb, v])
+            case _:
+                raise ValueError("UNREACHABLE")
+        return v
+
+    root = lit(f)
+    return clauses, root
+
+
+def satisfiable(clauses: list[Clause]) -> bool:
+    """
+    Decide la satisfacibilidad de un conjunto de cláusulas mediante DPLL con
+    propagación unitaria.
+
+    Args:
+        clauses: lista de cláusulas en formato DIMACS.
+
+    Returns:
+        True si existe una asignación que satisface todas las cláusulas.
+    """
+    return _dpll([frozenset(c) for c in clauses])
+
+
+def _simplify(
+    clauses: list[frozenset[int]], literal: int
+) -> list[frozenset[int]] | None:
+    """
+    Asigna un literal a cierto: elimina las cláusulas satisfechas y el
+    literal opuesto del resto. Devuelve None si aparece la cláusula vacía.
+    """
+    result = []
+    for c in clauses:
+        if literal in c:
+            continue
+        if -literal in c:
+            c = c - {-literal}
+            if not c:
+                return None
+        result.append(c)
+    return result
+
+
+def _dpll(clauses: list[frozenset[int]]) -> bool:
+    while True:
+        unit = next((c for c in clauses if len(c) == 1), None)
+        if unit is None:
+            break
+        simplified = _simplify(clauses, next(iter(unit)))
+        if simplified is None:
+            return False
+        clauses = simplified
+    if not clauses:
+        return True
+    literal = next(iter(clauses[0]))
+    for choice in (literal, -literal):
+        simplified = _simplify(clauses, choice)
+        if simplified is not None and _dpll(simplified):
+            return True
+    return False
+
+
+def is_tauto_sat(f: Formula) -> bool:
+    """
+    Determina si una fórmula es una tautología vía SAT: la fórmula es una
+    tautología si y solo si su negación es insatisfacible.
+    """
+    clauses, root = tseitin_clauses(f)
+    return not satisfiable(clauses + [[-root]])
@@ -146,6 +146,33 @@ def test_is_tauto_congruent(random_formula: Formula):
     assert random_formula.is_tauto == is_tauto(random_formula)
 
 
+def test_is_tauto_dpll_congruent(random_formula: Formula):
+    assert random_formula.is_tauto_dpll() == is_tauto(random_formula)
+
+
+def test_to_array_evaluate_congruent(random_formula: Formula):
+    array = random_formula.to_array()
+    assert len(array) <= len(random_formula)
+    indices = sorted(array.var_indices)
+    tauto = all(
+        array.evaluate({i: bool(n & (1 << k)) for k, i in enumerate(indices)})
+        for n in range(2 ** len(indices))
+    )
+    assert tauto == is_tauto(random_formula)
+
+
+def test_evaluate_batch_congruent(random_formula: Formula):
+    array = random_formula.to_array()
+    indices = sorted(array.var_indices)
+    assignments = [
+        {i: bool(n & (1 << k)) for k, i in enumerate(indices)}
+        for n in range(2 ** len(indices))
+    ]
+    assert array.evaluate_batch(assignments) == [
+        array.evaluate(assignment) for assignment in assignments
+    ]
+
+
 def test_subs_examples():
     A, B = Var.generate(2)
 
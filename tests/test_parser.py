@@ -0,0 +1,41 @@
+import pytest
+
+try:
+    from propositionalcalculus import parser, parser_cache
+except Exception:
+    pytest.skip(
+        "la gramática de tree-sitter no está compilada",
+        allow_module_level=True,
+    )
+
+from tree_sitter import Parser
+
+from propositionalcalculus.formula import Formula
+from propositionalcalculus.inference import InferenceRule
+
+EXAMPLE = "../../grammar/examples/MP.rule"
+
+
+@pytest.fixture
+def ts_parser(tmp_path, monkeypatch):
+    monkeypatch.setattr(parser_cache, "CACHE_PATH", tmp_path / "ast.sqlite")
+    monkeypatch.setattr(parser_cache, "_connection", None)
+    p = Parser()
+    p.set_language(parser.TSLANG)
+    return p
+
+
+def test_parse_formulas_and_rules_same_file(ts_parser):
+    formulas = parser.parse_formulas(ts_parser, EXAMPLE)
+    rules = parser.parse_rules(ts_parser, EXAMPLE)
+    assert all(isinstance(f, Formula) for f in formulas)
+    assert len(rules) == 1 and isinstance(rules[0], InferenceRule)
+
+
+def test_parse_cache_distinguishes_parsers(ts_parser):
+    formulas = parser.parse_formulas(ts_parser, EXAMPLE)
+    rules = parser.parse_rules(ts_parser, EXAMPLE)
+    # La segunda pasada viene de la caché persistente: cada parser debe
+    # recuperar su propio resultado, no el del otro.
+    assert parser.parse_rules(ts_parser, EXAMPLE) == rules
+    assert parser.parse_formulas(ts_parser, EXAMPLE) == formulas
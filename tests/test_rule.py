@@ -1,7 +1,31 @@
-from propositionalcalculus.formula import Var
+from propositionalcalculus.formula import And, Neg, Var
 import pytest
-from propositionalcalculus.rule import Rule
+from propositionalcalculus.rule import Rule, match_top, pattern_match
 
 
 def test_rule_match():
     pass
+
+
+def test_match_top_operator_mismatch():
+    A, B = Var.generate(2)
+    assert match_top(Neg(A), And(A, B)) is None
+
+
+def test_match_top_child_mismatch_fails():
+    A, B = Var.generate(2)
+    # El fallo en un hijo debe propagarse: A no puede ligarse a la vez a
+    # B y a Neg(B).
+    assert match_top(And(A, A), And(B, Neg(B))) is None
+
+
+def test_match_top_binding():
+    A, B = Var.generate(2)
+    binding = match_top(And(A, B), And(Neg(B), B))
+    assert binding == {A: Neg(B), B: B}
+
+
+def test_pattern_match_finds_subformula():
+    A, B = Var.generate(2)
+    matches = list(pattern_match(Neg(A), And(B, Neg(B))))
+    assert {A: B} in matches
@@ -0,0 +1,30 @@
+import pytest
+from propositionalcalculus.formula import Formula, Var
+from propositionalcalculus.sat import is_tauto_sat, satisfiable, tseitin_clauses
+from propositionalcalculus.table import is_tauto
+
+
+@pytest.fixture(scope="function")
+def random_formula() -> Formula:
+    return Formula.random(10, 10, True)
+
+
+def test_tseitin_linear_size(random_formula: Formula):
+    clauses, _ = tseitin_clauses(random_formula)
+    assert len(clauses) <= 3 * len(random_formula)
+
+
+def test_satisfiable_trivial():
+    assert satisfiable([[1, 2], [-1]])
+    assert not satisfiable([[1], [-1]])
+
+
+def test_is_tauto_sat_examples():
+    A, B = Var.generate(2)
+    assert is_tauto_sat(A | ~A)
+    assert is_tauto_sat((A & (A >> B)) >> B)
+    assert not is_tauto_sat(A >> B)
+
+
+def test_is_tauto_sat_congruent(random_formula: Formula):
+    assert is_tauto_sat(random_formula) == is_tauto(random_formula)